@@ -1,27 +1,44 @@
 from fastapi import FastAPI, HTTPException, File, UploadFile, Form
 from fastapi.responses import JSONResponse, FileResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Dict, Any, Optional
+from starlette.formparsers import MultiPartParser
+from typing import List, Dict, Any, Optional, Tuple
 import pandas as pd
+import numpy as np
 import io
+import functools
+import hashlib
+import asyncio
 import json
+import logging
 import re
 from datetime import datetime
-from PyPDF2 import PdfReader
-import openpyxl
-import xlrd
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, Image
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
-from PIL import Image as PILImage
 import os
-import secrets
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from charset_normalizer import from_bytes
+import orjson
+
+# Optional faster, layout-aware PDF text extraction
+try:
+    import pymupdf
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+    pymupdf = None
+
+# Optional JIT compilation for numeric kernels
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    njit = None
 
 from services.analysis_service import AnalysisService
 from services.scoring_service import ScoringService
@@ -32,8 +49,48 @@ from services.bias_detection import BiasDetectionService
 from services.audit_service import AuditService
 from services.contract_service import ContractService
 
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson, which also serializes numpy scalars and arrays"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
+# Debug diagnostics are emitted through logging so they cost nothing unless enabled
+logger = logging.getLogger(__name__)
+
+# Company analyses are queued and written to history in batches by a background task
+HISTORY_FLUSH_INTERVAL = 0.05  # seconds
+HISTORY_FLUSH_MAX_BACKOFF = 30.0  # seconds between retries while flushing keeps failing
+
+
+async def _flush_history_periodically():
+    delay = HISTORY_FLUSH_INTERVAL
+    while True:
+        await asyncio.sleep(delay)
+        try:
+            history_service.flush_pending()
+        except Exception:
+            # The batch stays queued; wait longer before each retry so a persistent error doesn't flood the log
+            delay = min(delay * 2, HISTORY_FLUSH_MAX_BACKOFF)
+            logger.exception("Error flushing analysis history; retrying in %.1fs", delay)
+        else:
+            delay = HISTORY_FLUSH_INTERVAL
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    history_flusher = asyncio.create_task(_flush_history_periodically())
+    try:
+        yield
+    finally:
+        history_flusher.cancel()
+        history_service.flush_pending()
+        PROCESS_POOL.shutdown(wait=False, cancel_futures=True)
+
+
 # Initialize FastAPI app
-app = FastAPI(title="OpenAudit API")
+app = FastAPI(title="OpenAudit API", default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -54,17 +111,61 @@ bias_detection_service = BiasDetectionService()
 audit_service = AuditService()
 contract_service = ContractService()
 
+# CPU-bound file parsing and PDF layout run here so they don't tie up the event loop or threadpool
+PROCESS_POOL = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+
+# Parse results of recent uploads, keyed on parse date, content hash and filename (LRU).
+# Values are (result, approximate bytes); the cache is bounded by the total of those sizes.
+_PARSE_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_PARSE_CACHE_MAX_BYTES = 64 << 20
+_parse_cache_bytes = 0
+
+
+def _replace_process_pool(broken_pool: ProcessPoolExecutor):
+    """Swap in a new PROCESS_POOL unless another request already replaced the broken one"""
+    global PROCESS_POOL
+    if PROCESS_POOL is broken_pool:
+        broken_pool.shutdown(wait=False, cancel_futures=True)
+        PROCESS_POOL = ProcessPoolExecutor(max_workers=os.cpu_count())
+
 
-def find_column(df: pd.DataFrame, possible_names: List[str]) -> Optional[str]:
-    """Find a column by trying multiple possible names"""
-    df_columns_lower = [col.lower().strip() for col in df.columns]
+async def _run_in_process_pool(func, *args):
+    """Run a picklable CPU-bound call in PROCESS_POOL, retrying once on a fresh pool if it broke"""
+    loop = asyncio.get_running_loop()
+    pool = PROCESS_POOL
+    try:
+        return await loop.run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        # A worker died (e.g. killed on a huge file); the job never runs in the API process itself
+        _replace_process_pool(pool)
+    pool = PROCESS_POOL
+    try:
+        return await loop.run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        _replace_process_pool(pool)
+        logger.error("Worker process died twice running %s", getattr(func, '__name__', func))
+        raise HTTPException(status_code=503, detail="Processing failed: the worker process crashed")
+
+
+def column_map(df: pd.DataFrame) -> Dict[str, str]:
+    """Map lowercased, stripped column names to the actual column names (first match wins)"""
+    col_map = {}
+    for col in df.columns:
+        col_map.setdefault(col.lower().strip(), col)
+    return col_map
+
+
+def find_column(df, possible_names: List[str]) -> Optional[str]:
+    """Find a column by trying multiple possible names.
+
+    Accepts a DataFrame or a prebuilt column_map(df) when looking up several columns.
+    """
+    col_map = column_map(df) if isinstance(df, pd.DataFrame) else df
     for name in possible_names:
-        name_lower = name.lower().strip()
-        if name_lower in df_columns_lower:
-            # Return the actual column name from the dataframe
-            for col in df.columns:
-                if col.lower().strip() == name_lower:
-                    return col
+        col = col_map.get(name.lower().strip())
+        if col is not None:
+            return col
     return None
 
 
@@ -75,25 +176,29 @@ def check_missing_values(df: pd.DataFrame, filename: str) -> Dict[str, Any]:
     Returns a dictionary with missing value details for table display.
     """
     missing_data = []
-    
+
     try:
         # Get column names and indices
         columns = list(df.columns)
-        
-        # Check each column for missing values
-        for col_idx, col_name in enumerate(columns):
-            # Find rows with missing values (NaN or None)
-            missing_mask = df[col_name].isnull()
-            missing_rows = df[missing_mask].index.tolist()
-            
-            # Find rows with empty strings
-            empty_mask = df[col_name].astype(str).str.strip() == ''
-            empty_rows = df[empty_mask].index.tolist()
-            
-            # Combine missing and empty rows (convert to 1-indexed for user display)
-            all_missing_rows = sorted(set([int(r) + 1 for r in missing_rows + empty_rows]))
-            
-            if len(all_missing_rows) > 0:
+        index_labels = df.index.to_numpy()
+
+        # Build one (rows x cols) mask of missing (NaN or None) or empty-string cells
+        combined_mask = np.array(df.isna(), dtype=bool)
+        # Only text-like columns can hold empty strings; numeric/datetime columns skip the str conversion
+        for col_idx, dtype in enumerate(df.dtypes):
+            if (pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_datetime64_any_dtype(dtype)
+                    or pd.api.types.is_timedelta64_dtype(dtype)):
+                continue
+            combined_mask[:, col_idx] |= (df.iloc[:, col_idx].astype(str).str.strip() == '').to_numpy()
+
+        # Transpose so hits come out grouped by column, then split them per column
+        hit_cols, hit_rows = np.nonzero(combined_mask.T)
+        rows_per_col = np.split(hit_rows, np.searchsorted(hit_cols, np.arange(1, len(columns))))
+
+        for col_idx, (col_name, rows) in enumerate(zip(columns, rows_per_col)):
+            if len(rows) > 0:
+                # Convert to 1-indexed for user display
+                all_missing_rows = (np.unique(index_labels[rows]).astype(np.int64) + 1).tolist()
                 col_number = col_idx + 1
                 missing_data.append({
                     'filename': filename,
@@ -110,216 +215,337 @@ def check_missing_values(df: pd.DataFrame, filename: str) -> Dict[str, Any]:
     return missing_data
 
 
-def normalize_transactions(df: pd.DataFrame) -> List[Dict[str, Any]]:
-    """Normalize dataframe columns to standard format and convert to transactions"""
+# Columns of the normalized transaction frames returned by the file parsers
+TRANSACTION_COLUMNS = ['amount', 'description', 'date']
+
+# Cell values that mean "no amount" in bank statement exports
+_BLANK_AMOUNT_VALUES = ['-', '', 'None', 'nan', 'NaN']
+
+# Date formats for text date columns, in order of preference
+_DATE_FORMATS = ['%Y-%m-%d', '%d-%m-%Y', '%m/%d/%Y', '%d/%m/%Y', '%Y/%m/%d', '%d-%m-%y', '%m-%d-%Y']
+
+# Date formats used by PDF bank statements
+_PDF_DATE_FORMATS = ['%d %b %Y', '%d-%m-%Y', '%d/%m/%Y']
+
+# Max baseline difference (in points) for PDF words to count as one row
+_PDF_ROW_TOLERANCE = 3
+
+# Patterns used when parsing amounts and dates, compiled once at import
+_CURRENCY_RE = re.compile(r'[,\u20B9]|Rs|RS')
+# A date ("31 OCT 2025", "31-10-2025") or an amount ("2,000.00") in a PDF statement row
+_PDF_TOKEN_RE = re.compile(
+    r'(?P<date>\d{1,2}\s+(?:JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)\s+\d{4}|\d{1,2}[-/]\d{1,2}[-/]\d{2,4})'
+    r'|(?P<amount>[\d,]+\.\d{2})',
+    re.IGNORECASE
+)
+_AMOUNT_FALLBACK_RE = re.compile(r'([\d,]+\.\d{2}|[\d,]+\.[\d]{1,2})')
+_AMOUNT_LOOSE_RE = re.compile(r'[\d,]+\.?\d*')
+
+# pd.read_csv options for uploads: plain string cells from the C parser
+_CSV_READ_OPTIONS = {'dtype': str, 'engine': 'c', 'low_memory': False}
+
+# Encodings considered when detecting the encoding of CSV/TXT uploads
+_TEXT_ENCODINGS = ['utf_8', 'utf_16', 'cp1252', 'latin_1']
+
+
+def _detect_encoding(content: bytes) -> str:
+    """Detect the text encoding of an uploaded file from its first 64 KiB"""
+    match = from_bytes(content[:65536], cp_isolation=_TEXT_ENCODINGS).best()
+    return match.encoding if match else 'utf-8'
+
+
+def _extract_pdf_text(content: bytes) -> str:
+    """Extract PDF text, rebuilding table rows from word positions when PyMuPDF is available"""
+    if not PYMUPDF_AVAILABLE:
+        from PyPDF2 import PdfReader
+        pdf_reader = PdfReader(io.BytesIO(content))
+        return "".join(page.extract_text() or "" for page in pdf_reader.pages)
+    
+    lines = []
+    with pymupdf.open(stream=content, filetype='pdf') as doc:
+        for page in doc:
+            # Words whose baselines line up belong to the same statement row
+            rows = []
+            for word in sorted(page.get_text('words'), key=lambda w: w[3]):
+                if rows and abs(word[3] - rows[-1][0]) <= _PDF_ROW_TOLERANCE:
+                    rows[-1][1].append(word)
+                else:
+                    rows.append((word[3], [word]))
+            for _, row_words in rows:
+                lines.append(' '.join(w[4] for w in sorted(row_words, key=lambda w: w[0])))
+    return '\n'.join(lines)
+
+
+def _frame_from_rows(rows) -> pd.DataFrame:
+    """Build a DataFrame from worksheet rows, taking the first row as the header like pd.read_excel"""
+    data = []
+    for row in rows:
+        row = [int(val) if isinstance(val, float) and val.is_integer() else val for val in row]
+        # Trim trailing empty cells
+        while row and (row[-1] is None or row[-1] == ''):
+            row.pop()
+        data.append(row)
+    while data and not data[-1]:
+        data.pop()  # Trailing blank rows
+    if not data:
+        return pd.DataFrame()
+    
+    width = max(len(row) for row in data)
+    header = data[0] + [None] * (width - len(data[0]))
+    columns = []
+    seen = {}
+    for i, name in enumerate(header):
+        name = f"Unnamed: {i}" if name is None or name == '' else name
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+    body = [row + [None] * (width - len(row)) for row in data[1:]]
+    return pd.DataFrame(body, columns=columns).fillna(np.nan).infer_objects()
+
+
+def _read_xlsx(content: bytes) -> pd.DataFrame:
+    """Read the active sheet of an .xlsx file by streaming cell values"""
+    import openpyxl
+    wb = openpyxl.load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+    try:
+        return _frame_from_rows(wb.active.iter_rows(values_only=True))
+    finally:
+        wb.close()
+
+
+def _read_xls(content: bytes) -> pd.DataFrame:
+    """Read the first sheet of an .xls file by streaming cell values"""
+    import xlrd
+    book = xlrd.open_workbook(file_contents=content, on_demand=True)
+    try:
+        sheet = book.sheet_by_index(0)
+        
+        def cell_value(cell):
+            if cell.ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK, xlrd.XL_CELL_ERROR):
+                return None
+            if cell.ctype == xlrd.XL_CELL_DATE:
+                return xlrd.xldate.xldate_as_datetime(cell.value, book.datemode)
+            if cell.ctype == xlrd.XL_CELL_BOOLEAN:
+                return bool(cell.value)
+            return cell.value
+        
+        return _frame_from_rows([cell_value(cell) for cell in row] for row in sheet.get_rows())
+    finally:
+        book.release_resources()
+
+
+def _parse_amounts(series: pd.Series):
+    """Parse an amount column into a float array plus a mask of placeholder cells like "-" """
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(dtype=float), np.zeros(len(series), dtype=bool)
+    
+    present = series.notna()
+    text = series.astype(str).str.strip()
+    placeholder = present & text.isin(_BLANK_AMOUNT_VALUES)
+    # Remove currency symbols and commas in one pass; to_numeric ignores the
+    # whitespace left around the number and coerces empty strings to NaN
+    cleaned = text.str.replace(_CURRENCY_RE, '', regex=True)
+    values = pd.to_numeric(cleaned.where(present & ~placeholder), errors='coerce')
+    return values.to_numpy(dtype=float), placeholder.to_numpy(dtype=bool)
+
+
+def _guess_date_format(values, formats: List[str]) -> Optional[str]:
+    """Return the first format that parses the first parseable value"""
+    for val in values:
+        for fmt in formats:
+            try:
+                datetime.strptime(val, fmt)
+                return fmt
+            except ValueError:
+                continue
+    return None
+
+
+def _parse_date_strings(text: pd.Series, formats: List[str]) -> pd.Series:
+    """Parse date strings with one cached pd.to_datetime pass per format present in the column"""
+    parsed = pd.Series(pd.NaT, index=text.index, dtype='datetime64[ns]')
+    pending = np.array(text != '', dtype=bool)
+    formats = list(formats)
+    # A column nearly always shares one format, so this usually runs once
+    while pending.any() and formats:
+        fmt = _guess_date_format(text[pending], formats)
+        if fmt is None:
+            break
+        parsed[pending] = pd.to_datetime(text[pending], format=fmt, errors='coerce', cache=True)
+        pending &= parsed.isna().to_numpy()
+        formats.remove(fmt)
+    return parsed
+
+
+def _format_dates(series: pd.Series, default: str) -> np.ndarray:
+    """Format a date column as YYYY-MM-DD strings, using default where no date can be parsed"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.strftime('%Y-%m-%d').fillna(default).to_numpy(dtype=object)
+    
+    values = series.to_numpy(dtype=object)
+    formatted = np.full(len(values), default, dtype=object)
+    present = pd.notna(values)
+    if pd.api.types.infer_dtype(series, skipna=True) == 'string':
+        is_text = present
+    else:
+        is_text = np.array([isinstance(val, str) for val in values], dtype=bool)
+    
+    text = pd.Series(values[is_text]).str.strip()
+    parsed = _parse_date_strings(text, _DATE_FORMATS)
+    formatted[is_text] = parsed.dt.strftime('%Y-%m-%d').fillna(default).to_numpy(dtype=object)
+    
+    # Already a date/datetime object (or something else stored in the column)
+    other = present & ~is_text
+    if other.any():
+        formatted[other] = [
+            val.strftime('%Y-%m-%d') if hasattr(val, 'strftime') else str(val)[:10]  # First 10 chars
+            for val in values[other]
+        ]
+    return formatted
+
+
+def normalize_transactions(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalize dataframe columns to standard format and return a TRANSACTION_COLUMNS frame"""
     df = df.copy()
     df.columns = df.columns.str.strip()  # Remove whitespace
+    col_map = column_map(df)
     
     # Find amount column with flexible matching - prioritize debit for expenses
-    debit_col = find_column(df, ['debit', 'debits', 'dr', 'withdrawal'])
-    credit_col = find_column(df, ['credit', 'credits', 'cr', 'deposit'])
+    debit_col = find_column(col_map, ['debit', 'debits', 'dr', 'withdrawal'])
+    credit_col = find_column(col_map, ['credit', 'credits', 'cr', 'deposit'])
     
     # For spending analysis, prefer debit column (money going out = expenses)
     # If debit column exists, use it; otherwise try general amount columns
     if debit_col:
         amount_col = debit_col
     else:
-        amount_col = find_column(df, [
+        amount_col = find_column(col_map, [
             'amount', 'amt', 'value', 'price', 'cost', 'total', 'sum', 
             'transaction_amount', 'amount_rs', 'rupees', 'inr', '₹', 'rs'
         ])
     
     # Find description column with flexible matching
-    desc_col = find_column(df, [
+    desc_col = find_column(col_map, [
         'description', 'desc', 'details', 'particulars', 'narration', 
         'transaction_description', 'memo', 'note', 'remarks', 'info', 
         'transaction_type', 'type', 'category'
     ])
     
     # Find date column with flexible matching
-    date_col = find_column(df, [
+    date_col = find_column(col_map, [
         'date', 'transaction_date', 'date_time', 'datetime', 'timestamp', 
         'trans_date', 'value_date', 'posting_date', 'time'
     ])
     
-    transactions = []
     current_date = datetime.now().strftime('%Y-%m-%d')
-    
-    # Process each row
-    for idx, row in df.iterrows():
-        transaction = {}
-        
-        # Extract amount - handle Debit/Credit columns specially
-        amount = None
-        
-        # If we have a debit column, ONLY use it for expenses
-        # Skip rows where debit is "-" (those are credit transactions)
-        if debit_col:
-            try:
-                val = row[debit_col]
-                if pd.notna(val):
-                    val_str = str(val).strip()
-                    # Handle "-" or empty values in debit column - these are credits, skip them
-                    if val_str and val_str not in ['-', '', 'None', 'nan', 'NaN']:
-                        # Remove currency symbols and commas
-                        clean_val = val_str.replace(',', '').replace('₹', '').replace('Rs', '').replace('RS', '').strip()
-                        if clean_val:
-                            try:
-                                amount = float(clean_val)
-                                # Only accept positive amounts for debit
-                                if amount > 0:
-                                    amount = abs(amount)  # Ensure positive
-                                else:
-                                    amount = None  # Skip zero/negative in debit column
-                            except (ValueError, TypeError):
-                                amount = None
-                    else:
-                        # Debit is "-" or empty, this is a credit transaction - SKIP IT
-                        continue  # Skip this row entirely - it's not an expense
-            except (ValueError, TypeError, KeyError):
-                # If we have debit column but can't read it, skip this row
-                continue
-        
-        # If no debit amount found, try the general amount column
-        if amount is None or amount == 0:
-            if amount_col and amount_col != debit_col:
-                try:
-                    val = row[amount_col]
-                    if pd.notna(val):
-                        val_str = str(val).strip()
-                        if val_str and val_str not in ['-', '', 'None', 'nan', 'NaN']:
-                            clean_val = val_str.replace(',', '').replace('₹', '').replace('Rs', '').replace('RS', '').strip()
-                            if clean_val:
-                                try:
-                                    amount = abs(float(clean_val))  # Use absolute value
-                                except (ValueError, TypeError):
-                                    pass
-                except (ValueError, TypeError, KeyError):
-                    pass
-        
-        # If no amount column found, try to extract from any numeric column
-        # BUT skip columns we've already tried (debit_col, amount_col, date_col, desc_col)
-        if amount is None:
-            skipped_cols = {debit_col, amount_col, date_col, desc_col}
-            for col in df.columns:
-                if col in skipped_cols:
-                    continue
-                try:
-                    val = row[col]
-                    if pd.notna(val):
-                        val_str = str(val).strip()
-                        if val_str and val_str not in ['-', '', 'None', 'nan', 'NaN']:
-                            clean_val = val_str.replace(',', '').replace('₹', '').replace('Rs', '').replace('RS', '').strip()
-                            if clean_val:
-                                try:
-                                    num_val = abs(float(clean_val))
-                                    # If it's a reasonable amount (not a date, ID, etc.)
-                                    # Skip balance column (usually very large numbers)
-                                    if 0.01 <= num_val <= 999999999 and col.lower() not in ['balance', 'bal']:
-                                        amount = num_val
-                                        break
-                                except (ValueError, TypeError):
-                                    continue
-                except (ValueError, TypeError, KeyError):
-                    continue
-        
-        # If still no amount, use 0 as default
-        if amount is None:
-            amount = 0.0
-        
-        # Extract description
-        description = ""
-        if desc_col:
-            desc_val = row[desc_col]
-            if pd.notna(desc_val):
-                description = str(desc_val).strip()
-        
-        # If no description column, try to create from other columns
-        if not description:
-            other_cols = []
-            for col in df.columns:
-                if col not in [amount_col, date_col]:
-                    val = row[col]
-                    if pd.notna(val):
-                        other_cols.append(str(val).strip())
-            description = " | ".join(other_cols[:3])  # Use first 3 non-numeric columns
-        
-        # If still no description, use default
-        if not description:
-            description = f"Transaction {idx + 1}"
-        
-        # Extract date
-        if date_col:
-            try:
-                date_val = row[date_col]
-                if pd.notna(date_val):
-                    # Try to parse date
-                    if isinstance(date_val, str):
-                        # Try common date formats
-                        for fmt in ['%Y-%m-%d', '%d-%m-%Y', '%m/%d/%Y', '%d/%m/%Y', '%Y/%m/%d', '%d-%m-%y', '%m-%d-%Y']:
-                            try:
-                                parsed_date = datetime.strptime(date_val.strip(), fmt)
-                                transaction['date'] = parsed_date.strftime('%Y-%m-%d')
-                                break
-                            except:
-                                continue
-                    else:
-                        # Already a date/datetime object
-                        if hasattr(date_val, 'strftime'):
-                            transaction['date'] = date_val.strftime('%Y-%m-%d')
-                        else:
-                            transaction['date'] = str(date_val)[:10]  # First 10 chars
-            except:
-                pass
-        
-        # Use current date if no date found
-        if 'date' not in transaction:
-            transaction['date'] = current_date
-        
-        # Ensure amount is set (use 0 if None)
-        if amount is None:
-            amount = 0.0
-        else:
-            amount = abs(float(amount))  # Ensure positive and numeric
-        
-        # Only add if we have a valid amount (> 0) OR a description (even with 0 amount)
-        # For spending analysis, prioritize transactions with amounts > 0
-        if amount > 0 or description:
-            transaction['amount'] = float(amount)
-            transaction['description'] = description
-            transactions.append(transaction)
-    
-    return transactions
+    row_count = len(df)
+
+    # Extract amount - handle Debit/Credit columns specially
+    amounts = np.full(row_count, np.nan)
+    keep_rows = np.ones(row_count, dtype=bool)
+
+    # If we have a debit column, ONLY use it for expenses
+    if debit_col:
+        debit_values, debit_placeholder = _parse_amounts(df[debit_col])
+        # Debit is "-" or empty, this is a credit transaction - SKIP IT
+        keep_rows &= ~debit_placeholder
+        # Only accept positive amounts for debit (zero/negative fall through to other columns)
+        amounts = np.where(debit_values > 0, debit_values, np.nan)
+    elif amount_col:
+        # No debit column, use the general amount column (absolute value)
+        amounts = np.abs(_parse_amounts(df[amount_col])[0])
+
+    # If no amount found, try to extract from any numeric column
+    # BUT skip columns we've already tried (debit_col, amount_col, date_col, desc_col)
+    skipped_cols = {debit_col, amount_col, date_col, desc_col}
+    # Skip balance column (usually very large numbers)
+    candidate_positions = [
+        i for i, col in enumerate(df.columns)
+        if col not in skipped_cols and str(col).lower() not in ['balance', 'bal']
+    ]
+    pending_rows = np.flatnonzero(np.isnan(amounts))
+    if len(pending_rows) and candidate_positions:
+        pending_df = df.iloc[pending_rows, candidate_positions]
+        values = np.abs(np.column_stack([
+            _parse_amounts(pending_df.iloc[:, i])[0] for i in range(len(candidate_positions))
+        ]))
+        # If it's a reasonable amount (not a date, ID, etc.), take the first such column per row
+        valid = (values >= 0.01) & (values <= 999999999)
+        first_valid = valid.argmax(axis=1)
+        found = valid.any(axis=1)
+        amounts[pending_rows[found]] = values[found.nonzero()[0], first_valid[found]]
+
+    # If still no amount, use 0 as default
+    amounts = np.where(np.isnan(amounts), 0.0, amounts)
+
+    # Extract description
+    if desc_col:
+        desc_values = df[desc_col]
+        descriptions = desc_values.astype(str).str.strip().where(desc_values.notna(), '').to_numpy(dtype=object)
+    else:
+        descriptions = np.full(row_count, '', dtype=object)
+
+    # If no description column, try to create from other columns
+    missing_desc = descriptions == ''
+    other_cols = [col for col in df.columns if col not in [amount_col, date_col]]
+    if missing_desc.any() and other_cols:
+        other_df = df.loc[missing_desc, other_cols]
+        other_values = other_df.to_numpy(dtype=object)
+        other_present = other_df.notna().to_numpy()
+        descriptions[missing_desc] = [
+            " | ".join(str(val).strip() for val in row_values[row_present][:3])  # Use first 3 non-empty columns
+            for row_values, row_present in zip(other_values, other_present)
+        ]
+
+    # If still no description, use default
+    missing_desc = descriptions == ''
+    if missing_desc.any():
+        descriptions[missing_desc] = [f"Transaction {idx + 1}" for idx in df.index[missing_desc]]
+
+    # Extract date, using current date if no date found
+    if date_col:
+        dates = _format_dates(df[date_col], current_date)
+    else:
+        dates = np.full(row_count, current_date, dtype=object)
+
+    result_df = pd.DataFrame({
+        'amount': amounts[keep_rows],
+        'description': descriptions[keep_rows],
+        'date': dates[keep_rows]
+    })
+    return result_df
+
+
+# Top-level (picklable) so it can run in PROCESS_POOL
+def _placeholder_transactions(description: str, date: str) -> List[Dict[str, Any]]:
+    """A single zero-amount transaction, used when a file yields no usable rows"""
+    return [{'amount': 0.0, 'description': description, 'date': date}]
 
 
-def process_file(file: UploadFile) -> Dict[str, Any]:
-    """Process a single file and extract data - flexible and handles any format"""
-    filename = file.filename
+def _parse_bytes(content: bytes, filename: str) -> Dict[str, Any]:
+    """Parse raw file bytes and extract data - flexible and handles any format"""
     file_ext = filename.split('.')[-1].lower() if '.' in filename else ''
     file_errors = []
     file_warnings = []
     transactions = []
     missing_values_data = []  # Store detailed missing value information
+    today_str = datetime.now().strftime('%Y-%m-%d')  # Default date for rows without one
     
     try:
-        content = file.file.read()
-        file.file.seek(0)  # Reset file pointer
-        
         df = None
         
         if file_ext in ['csv']:
             try:
-                # Try reading with different encodings
-                encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
-                for encoding in encodings:
-                    try:
-                        df = pd.read_csv(io.BytesIO(content), encoding=encoding)
-                        break
-                    except:
-                        continue
-                
-                if df is None:
-                    df = pd.read_csv(io.BytesIO(content))  # Default encoding
+                # Detect the encoding once, then parse a single time. Cells are read as
+                # strings and coerced when normalizing, which skips type inference
+                encoding = _detect_encoding(content)
+                try:
+                    df = pd.read_csv(io.BytesIO(content), encoding=encoding, **_CSV_READ_OPTIONS)
+                except UnicodeDecodeError:
+                    df = pd.read_csv(io.BytesIO(content), encoding='utf-8', encoding_errors='replace', **_CSV_READ_OPTIONS)
                 
                 # Check for missing values in CSV (separate case - doesn't affect processing)
                 if df is not None and not df.empty:
@@ -337,9 +563,9 @@ def process_file(file: UploadFile) -> Dict[str, Any]:
         elif file_ext in ['xlsx', 'xls']:
             try:
                 if file_ext == 'xlsx':
-                    df = pd.read_excel(io.BytesIO(content), engine='openpyxl')
+                    df = _read_xlsx(content)
                 else:
-                    df = pd.read_excel(io.BytesIO(content), engine='xlrd')
+                    df = _read_xls(content)
                 
                 # Check for missing values in Excel (separate case - doesn't affect processing)
                 if df is not None and not df.empty:
@@ -358,64 +584,54 @@ def process_file(file: UploadFile) -> Dict[str, Any]:
         # Process dataframe if we have one
         if df is not None and not df.empty:
             # DEBUG: Log what columns we have
-            print(f"[FILE DEBUG] File: {filename}, Columns: {list(df.columns)}")
-            print(f"[FILE DEBUG] DataFrame shape: {df.shape}, First row sample: {df.iloc[0].to_dict() if len(df) > 0 else 'None'}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[FILE DEBUG] File: %s, Columns: %s", filename, list(df.columns))
+                logger.debug("[FILE DEBUG] DataFrame shape: %s, First row sample: %s", df.shape, df.iloc[0].to_dict())
             
             try:
                 # Normalize and convert to transactions
                 transactions = normalize_transactions(df)
                 
                 # DEBUG: Log what transactions we extracted
-                if transactions:
-                    total_extracted = sum(t.get('amount', 0) for t in transactions)
-                    non_zero_extracted = len([t for t in transactions if t.get('amount', 0) > 0])
-                    print(f"[FILE DEBUG] Extracted {len(transactions)} transactions, total={total_extracted}, non-zero={non_zero_extracted}")
-                    print(f"[FILE DEBUG] Sample extracted transaction: {transactions[0] if transactions else 'None'}")
+                if not transactions.empty and logger.isEnabledFor(logging.DEBUG):
+                    amt = transactions['amount'].to_numpy()
+                    logger.debug("[FILE DEBUG] Extracted %d transactions, total=%s, non-zero=%d",
+                                 len(transactions), amt.sum(), int((amt > 0).sum()))
+                    logger.debug("[FILE DEBUG] Sample extracted transaction: %s", transactions.iloc[0].to_dict())
                 
-                if not transactions:
+                if transactions.empty:
                     file_warnings.append("File processed but no transaction data could be extracted. Please check your file format.")
                     # Create at least one transaction from the file
-                    transactions = [{
-                        'amount': 0.0,
-                        'description': f"Data from {filename}",
-                        'date': datetime.now().strftime('%Y-%m-%d')
-                    }]
+                    transactions = _placeholder_transactions(f"Data from {filename}", today_str)
             except Exception as e:
                 file_warnings.append(f"Error normalizing data: {str(e)}")
                 # Try to create basic transactions from raw data
                 try:
-                    for idx, row in df.iterrows():
+                    # Only the row label is used, so walk the index rather than building a Series per row
+                    for idx in df.index:
                         transactions.append({
                             'amount': float(idx) if pd.notna(idx) else 0.0,
                             'description': f"Row {idx + 1}",
-                            'date': datetime.now().strftime('%Y-%m-%d')
+                            'date': today_str
                         })
                 except:
-                    transactions = [{
-                        'amount': 0.0,
-                        'description': f"Data from {filename}",
-                        'date': datetime.now().strftime('%Y-%m-%d')
-                    }]
+                    transactions = _placeholder_transactions(f"Data from {filename}", today_str)
         
         elif file_ext == 'pdf':
             try:
-                pdf_reader = PdfReader(io.BytesIO(content))
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
+                text = _extract_pdf_text(content)
                 
                 if not text.strip():
                     file_warnings.append("PDF contains no extractable text. May need OCR.")
-                    transactions = [{
-                        'amount': 0.0,
-                        'description': f"PDF file: {filename} (no extractable text)",
-                        'date': datetime.now().strftime('%Y-%m-%d')
-                    }]
+                    transactions = _placeholder_transactions(f"PDF file: {filename} (no extractable text)", today_str)
                 else:
                     # Try to extract structured data from PDF text
                     # First, try to parse as a table (for bank statements with columns)
                     lines = text.split('\n')
-                    extracted_transactions = []
+                    # Extracted rows are collected column-wise and become one frame at the end
+                    pdf_amounts = []
+                    pdf_descriptions = []
+                    pdf_dates = []
                     
                     # Look for table-like structure with Date, Details, Debit, Credit, Balance
                     # Try to identify header row
@@ -433,152 +649,108 @@ def process_file(file: UploadFile) -> Dict[str, Any]:
                             if not line or len(line) < 10:
                                 continue
                             
-                            # Try to extract date (patterns like "31 OCT 2025" or "31-10-2025")
-                            date_match = re.search(r'(\d{1,2}\s+(?:JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)\s+\d{4})', line, re.IGNORECASE)
-                            if not date_match:
-                                date_match = re.search(r'(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})', line)
+                            # For spending analysis, only process debit transactions
+                            line_upper = line.upper()
+                            if 'TRANSFER FROM' in line_upper or 'CR' in line_upper:
+                                continue  # Skip credit transactions
+                            
+                            # One left-to-right scan picks up the date (patterns like "31 OCT 2025"
+                            # or "31-10-2025") and every amount with 2 decimal places (100.00, 2,000.00)
+                            date_match = None
+                            amount_matches = []
+                            for token in _PDF_TOKEN_RE.finditer(line):
+                                if token.lastgroup == 'amount':
+                                    amount_matches.append(token)
+                                elif date_match is None:
+                                    date_match = token
                             
                             if date_match:
-                                date_str = date_match.group(1)
-                                try:
-                                    # Parse date
-                                    date_obj = None
-                                    try:
-                                        date_obj = datetime.strptime(date_str, '%d %b %Y')
-                                    except:
-                                        try:
-                                            date_obj = datetime.strptime(date_str, '%d-%m-%Y')
-                                        except:
-                                            try:
-                                                date_obj = datetime.strptime(date_str, '%d/%m/%Y')
-                                            except:
-                                                pass
-                                    date_val = date_obj.strftime('%Y-%m-%d') if date_obj else datetime.now().strftime('%Y-%m-%d')
-                                except:
-                                    date_val = datetime.now().strftime('%Y-%m-%d')
-                                
-                                # Check if this is a debit transaction (TRANSFER TO) or credit (TRANSFER FROM)
-                                line_upper = line.upper()
+                                # Dates are parsed for the whole file once the table is read
+                                date_str = date_match.group('date')
+                                # Check if this is a debit transaction (TRANSFER TO)
                                 is_debit = 'TRANSFER TO' in line_upper or 'DR' in line_upper
-                                is_credit = 'TRANSFER FROM' in line_upper or 'CR' in line_upper
-                                
-                                # For spending analysis, only process debit transactions
-                                if is_credit:
-                                    continue  # Skip credit transactions
-                                
-                                # Extract all amounts with 2 decimal places (typical format: 100.00, 2,000.00)
-                                amount_patterns = re.findall(r'([\d,]+\.\d{2})', line)
                                 
+                                # Bank statement structure: Date | Details | Ref No | Debit | Credit | Balance
+                                # For debit transactions, we want the Debit column value
+                                # Usually debit comes after details, balance is usually last
+                                date_end = date_match.end()
                                 debit_amount = None
-                                if amount_patterns:
-                                    # Bank statement structure: Date | Details | Ref No | Debit | Credit | Balance
-                                    # For debit transactions, we want the Debit column value
-                                    # Strategy: Find amounts after the details but before balance (usually the last amount)
-                                    
-                                    # Look for amounts that are reasonable expense values
-                                    # Usually debit comes after details, balance is usually last
-                                    date_end = date_match.end()
-                                    
-                                    # Find position of details end (look for end of transaction description)
-                                    # Details usually end before amounts start
-                                    for amt_str in amount_patterns:
-                                        amt_pos = line.find(amt_str)
-                                        # Amount should be after date and some description text
-                                        if amt_pos > date_end + 30:  # After date and reasonable description
-                                            try:
-                                                amt = float(amt_str.replace(',', ''))
-                                                # Check if it's a reasonable expense amount (not balance which could be very large)
-                                                # Debit amounts are usually smaller than balance
-                                                if 0.01 <= amt <= 10000000:  # Reasonable expense range
-                                                    # If this is a debit transaction, this amount is likely the debit
-                                                    if is_debit:
-                                                        debit_amount = amt
-                                                        break
-                                                    # If we don't know transaction type, take first reasonable amount
-                                                    elif debit_amount is None:
-                                                        debit_amount = amt
-                                            except:
-                                                pass
+                                for amt_match in amount_matches:
+                                    # Amount should be after date and some description text
+                                    if amt_match.start() > date_end + 30:
+                                        amt = float(amt_match.group('amount').replace(',', ''))
+                                        # Check if it's a reasonable expense amount (not balance which could be very large)
+                                        if 0.01 <= amt <= 10000000:  # Reasonable expense range
+                                            # If this is a debit transaction, this amount is likely the debit
+                                            if is_debit:
+                                                debit_amount = amt
+                                                break
+                                            # If we don't know transaction type, take first reasonable amount
+                                            elif debit_amount is None:
+                                                debit_amount = amt
                                 
                                 # Extract description (between date and first amount)
-                                description = ""
-                                if date_match:
-                                    desc_start = date_match.end()
-                                    desc_end = len(line)
-                                    # Find where amounts start
-                                    for amt_str in amount_patterns:
-                                        amt_pos = line.find(amt_str)
-                                        if amt_pos > desc_start:
-                                            desc_end = amt_pos
-                                            break
-                                    description = line[desc_start:desc_end].strip()
+                                desc_end = next(
+                                    (amt_match.start() for amt_match in amount_matches if amt_match.start() > date_end),
+                                    len(line)
+                                )
+                                description = line[date_end:desc_end].strip()
                                 
                                 # Use debit amount for expense (only process if we have a debit amount)
                                 if debit_amount and debit_amount > 0:
-                                    extracted_transactions.append({
-                                        'amount': debit_amount,
-                                        'description': description or 'Transaction',
-                                        'date': date_val
-                                    })
+                                    pdf_amounts.append(debit_amount)
+                                    pdf_descriptions.append(description or 'Transaction')
+                                    pdf_dates.append(date_str)
+                        
+                        if pdf_dates:
+                            parsed_dates = _parse_date_strings(pd.Series(pdf_dates, dtype=object), _PDF_DATE_FORMATS)
+                            pdf_dates = parsed_dates.dt.strftime('%Y-%m-%d').fillna(today_str).to_numpy(dtype=object)
                     
                     # If no table structure found, fall back to simple line-by-line extraction
-                    if not extracted_transactions:
+                    if not len(pdf_amounts):
                         for line in lines:
                             line = line.strip()
                             if line and len(line) > 5:  # Skip very short lines
                                 # Try to extract amount (look for numbers)
-                                amounts = re.findall(r'([\d,]+\.\d{2}|[\d,]+\.[\d]{1,2})', line)
+                                amounts = _AMOUNT_FALLBACK_RE.findall(line)
                                 if amounts:
                                     try:
                                         amount = float(amounts[-1].replace(',', ''))
                                         description = line[:line.rfind(amounts[-1])].strip() if amounts[-1] in line else line[:50]
                                         if description and amount > 0:
-                                            extracted_transactions.append({
-                                                'amount': amount,
-                                                'description': description,
-                                                'date': datetime.now().strftime('%Y-%m-%d')
-                                            })
+                                            pdf_amounts.append(amount)
+                                            pdf_descriptions.append(description)
+                                            pdf_dates.append(today_str)
                                     except:
                                         pass
                     
-                    if extracted_transactions:
-                        transactions = extracted_transactions
+                    if len(pdf_amounts):
+                        transactions = pd.DataFrame({
+                            'amount': np.array(pdf_amounts, dtype=np.float64),
+                            'description': np.array(pdf_descriptions, dtype=object),
+                            'date': np.asarray(pdf_dates, dtype=object)
+                        }, copy=False)
                     else:
                         # Create transaction from PDF text
                         text_preview = text.replace('\n', ' ').strip()[:200]
-                        transactions = [{
-                            'amount': 0.0,
-                            'description': f"PDF: {text_preview}...",
-                            'date': datetime.now().strftime('%Y-%m-%d')
-                        }]
+                        transactions = _placeholder_transactions(f"PDF: {text_preview}...", today_str)
             except Exception as e:
                 file_warnings.append(f"Failed to parse PDF: {str(e)}")
-                transactions = [{
-                    'amount': 0.0,
-                    'description': f"PDF file: {filename}",
-                    'date': datetime.now().strftime('%Y-%m-%d')
-                }]
+                transactions = _placeholder_transactions(f"PDF file: {filename}", today_str)
                 
         elif file_ext in ['txt']:
             try:
-                # Try different encodings
-                encodings = ['utf-8', 'latin-1', 'iso-8859-1']
-                text = None
-                for encoding in encodings:
-                    try:
-                        text = content.decode(encoding)
-                        break
-                    except:
-                        continue
-                
-                if text is None:
+                # Detect the encoding once, then decode a single time
+                try:
+                    text = content.decode(_detect_encoding(content))
+                except UnicodeDecodeError:
                     text = content.decode('utf-8', errors='ignore')
                 
                 lines = text.split('\n')
                 for line in lines:
                     line = line.strip()
                     if line and len(line) > 3:
-                        amounts = re.findall(r'[\d,]+\.?\d*', line)
+                        amounts = _AMOUNT_LOOSE_RE.findall(line)
                         if amounts:
                             try:
                                 amount = float(amounts[-1].replace(',', ''))
@@ -587,7 +759,7 @@ def process_file(file: UploadFile) -> Dict[str, Any]:
                                     transactions.append({
                                         'amount': amount,
                                         'description': description,
-                                        'date': datetime.now().strftime('%Y-%m-%d')
+                                        'date': today_str
                                     })
                             except:
                                 pass
@@ -595,68 +767,137 @@ def process_file(file: UploadFile) -> Dict[str, Any]:
                 if not transactions:
                     # Create from text content
                     text_preview = text[:200].replace('\n', ' ')
-                    transactions = [{
-                        'amount': 0.0,
-                        'description': f"Text file: {text_preview}...",
-                        'date': datetime.now().strftime('%Y-%m-%d')
-                    }]
+                    transactions = _placeholder_transactions(f"Text file: {text_preview}...", today_str)
             except Exception as e:
                 file_warnings.append(f"Failed to parse text file: {str(e)}")
-                transactions = [{
-                    'amount': 0.0,
-                    'description': f"Text file: {filename}",
-                    'date': datetime.now().strftime('%Y-%m-%d')
-                }]
+                transactions = _placeholder_transactions(f"Text file: {filename}", today_str)
                 
         elif file_ext in ['jpg', 'jpeg', 'png']:
             file_warnings.append("Image files require OCR. Creating placeholder transaction.")
-            transactions = [{
-                'amount': 0.0,
-                'description': f"Image file: {filename} (OCR not implemented)",
-                'date': datetime.now().strftime('%Y-%m-%d')
-            }]
+            transactions = _placeholder_transactions(f"Image file: {filename} (OCR not implemented)", today_str)
         else:
             if df is None:
                 file_warnings.append(f"Unknown file type: {file_ext}. Attempting to process as generic data.")
                 # Try to create at least one transaction
-                transactions = [{
-                    'amount': 0.0,
-                    'description': f"File: {filename}",
-                    'date': datetime.now().strftime('%Y-%m-%d')
-                }]
+                transactions = _placeholder_transactions(f"File: {filename}", today_str)
             
     except Exception as e:
         file_warnings.append(f"Error processing file: {str(e)}")
         # Always create at least one transaction so processing can continue
-        transactions = [{
-            'amount': 0.0,
-            'description': f"File: {filename}",
-            'date': datetime.now().strftime('%Y-%m-%d')
-        }]
+        transactions = _placeholder_transactions(f"File: {filename}", today_str)
     
     # Ensure we always have at least one transaction
-    if not transactions:
-        transactions = [{
-            'amount': 0.0,
-            'description': f"File: {filename}",
-            'date': datetime.now().strftime('%Y-%m-%d')
-        }]
+    if len(transactions) == 0:
+        transactions = _placeholder_transactions(f"File: {filename}", today_str)
     
     return {
         'filename': filename,
-        'transactions': transactions,
+        'transactions': pd.DataFrame(transactions, columns=TRANSACTION_COLUMNS),
         'errors': file_errors,
         'warnings': file_warnings,
         'missing_values': missing_values_data  # Detailed missing value data for table display
     }
 
 
+def _cache_parse_result(cache_key: str, result: Dict[str, Any]):
+    """Store a parse result, evicting least recently used entries to stay under _PARSE_CACHE_MAX_BYTES"""
+    global _parse_cache_bytes
+    size = int(result['transactions'].memory_usage(index=True, deep=True).sum())
+    if size > _PARSE_CACHE_MAX_BYTES or cache_key in _PARSE_CACHE:
+        return
+    _PARSE_CACHE[cache_key] = (result, size)
+    _parse_cache_bytes += size
+    while _parse_cache_bytes > _PARSE_CACHE_MAX_BYTES:
+        _, (_, evicted_size) = _PARSE_CACHE.popitem(last=False)
+        _parse_cache_bytes -= evicted_size
+
+
+async def process_file(file: UploadFile) -> Dict[str, Any]:
+    """Read an uploaded file without blocking and parse it in the process pool"""
+    content = await file.read()
+    # Nothing reads the upload again, so release its spooled buffer/temp file before parsing
+    await file.close()
+    
+    # Re-uploads of the same file on the same day reuse the earlier parse; the date is part
+    # of the key because rows without a date are given the day they were parsed
+    today_str = datetime.now().strftime('%Y-%m-%d')
+    cache_key = f"{today_str}:{hashlib.blake2b(content, digest_size=16).hexdigest()}:{file.filename}"
+    cached = _PARSE_CACHE.get(cache_key)
+    if cached is not None:
+        _PARSE_CACHE.move_to_end(cache_key)
+        result = cached[0]
+    else:
+        result = await _run_in_process_pool(_parse_bytes, content, file.filename)
+        _cache_parse_result(cache_key, result)
+    # Callers replace columns and extend the lists but never write into the cached frame's
+    # arrays, so a shallow copy shares the parsed rows instead of duplicating every upload
+    return {
+        **result,
+        'transactions': result['transactions'].copy(deep=False),
+        'errors': list(result['errors']),
+        'warnings': list(result['warnings']),
+        'missing_values': list(result['missing_values'])
+    }
+
+
+async def process_files(files: List[UploadFile]) -> List[Dict[str, Any]]:
+    """Process several uploads concurrently, returning results in upload order"""
+    return await asyncio.gather(*(process_file(file) for file in files))
+
+
+def _default_analysis_results(df: pd.DataFrame, processed_data: Optional[Dict[str, Any]], today_str: str) -> Dict[str, Any]:
+    """Fallback results for each company analysis stage, used when that stage fails"""
+    if processed_data is None:
+        processed_data = {
+            "total_transactions": len(df),
+            "total_amount": float(df['amount'].sum()) if 'amount' in df.columns else 0.0,
+            "date_range": {
+                "start": today_str,
+                "end": today_str
+            },
+            "transactions": df.to_dict(orient='records')
+        }
+    total_amount = processed_data.get("total_amount", 0)
+    return {
+        "processed_data": processed_data,
+        "categorized_data": {
+            "categories": {},
+            "category_totals": {},
+            "category_percentages": {},
+            "total_amount": total_amount,
+            "transaction_count": len(df)
+        },
+        "insights": {
+            "top_category": {"name": "Other", "percentage": 0, "amount": 0},
+            "category_breakdown": {},
+            "total_spent": total_amount,
+            "transaction_count": len(df)
+        },
+        "visualizations": {
+            "pie_chart": [],
+            "bar_chart": [],
+            "summary_stats": {"total_categories": 0, "largest_category": None, "smallest_category": None}
+        },
+        "smart_score": {
+            "score": 5.0,
+            "max_score": 10.0,
+            "spender_rating": "Moderate Spender",
+            "components": {},
+            "savings_bonus": 0,
+            "interpretation": "Analysis completed",
+            "recommendations": []
+        }
+    }
+
+
 @app.post("/api/company/analyze")
 async def analyze_company_files(
     files: List[UploadFile] = File(...),
     user_id: str = Form(None)
 ):
     """Analyze multiple files for company financial analysis"""
+    now = datetime.now()
+    today_str = now.strftime('%Y-%m-%d')
     try:
         if not files:
             raise HTTPException(status_code=400, detail="No files provided")
@@ -664,14 +905,12 @@ async def analyze_company_files(
         if not user_id:
             raise HTTPException(status_code=400, detail="user_id is required")
         
-        all_transactions = []
+        transaction_frames = []
         all_file_errors = []
         all_file_warnings = []
         
-        # Process all files - always succeeds
-        for file in files:
-            result = process_file(file)
-            
+        # Process all files concurrently - always succeeds
+        for result in await process_files(files):
             if result['errors']:
                 all_file_errors.append({
                     'filename': result['filename'],
@@ -684,125 +923,52 @@ async def analyze_company_files(
                     'warnings': result['warnings']
                 })
             
-            # Always extend transactions - process_file always returns at least one
-            all_transactions.extend(result['transactions'])
+            # Always collect transactions - process_file always returns at least one
+            transaction_frames.append(result['transactions'])
         
-        # Normalize all transactions - ensure they have required fields
-        valid_transactions = []
-        for txn in all_transactions:
-            if isinstance(txn, dict):
-                try:
-                    # Ensure amount exists and is numeric
-                    amount = txn.get('amount', 0)
-                    try:
-                        amount = float(amount) if amount is not None else 0.0
-                    except (ValueError, TypeError):
-                        amount = 0.0
-                    
-                    # Ensure description exists
-                    description = str(txn.get('description', f"Transaction from file"))
-                    if not description or description.strip() == '':
-                        description = "Transaction"
-                    
-                    # Ensure date exists
-                    date = txn.get('date')
-                    if not date:
-                        date = datetime.now().strftime('%Y-%m-%d')
-                    
-                    valid_transactions.append({
-                        'amount': amount,
-                        'description': description,
-                        'date': date
-                    })
-                except Exception:
-                    # If anything goes wrong, create a default transaction
-                    valid_transactions.append({
-                        'amount': 0.0,
-                        'description': f"Transaction",
-                        'date': datetime.now().strftime('%Y-%m-%d')
-                    })
+        # Join the per-file columns directly rather than aligning whole frames
+        df = pd.DataFrame({
+            col: np.concatenate([frame[col].to_numpy(dtype=object) for frame in transaction_frames])
+            for col in TRANSACTION_COLUMNS
+        }, copy=False)
+        
+        # Normalize all transactions column-wise - ensure they have required fields
+        df['amount'] = pd.to_numeric(df['amount'], errors='coerce').fillna(0.0).astype('float64')
+        df['description'] = df['description'].fillna('Transaction').astype(str)
+        df.loc[df['description'].str.strip() == '', 'description'] = 'Transaction'
+        df['date'] = df['date'].where(df['date'].notna() & (df['date'] != ''), today_str)
         
         # Always ensure we have at least one transaction
-        if not valid_transactions:
-            valid_transactions = [{
+        if df.empty:
+            df = pd.DataFrame([{
                 'amount': 0.0,
                 'description': 'File uploaded successfully',
-                'date': datetime.now().strftime('%Y-%m-%d')
-            }]
-        
-        # Convert to DataFrame for analysis
-        df = pd.DataFrame(valid_transactions)
-        
-        # Ensure required columns exist (they should always exist now)
-        if 'amount' not in df.columns:
-            df['amount'] = 0.0
-        if 'description' not in df.columns:
-            df['description'] = 'Transaction'
-        if 'date' not in df.columns:
-            df['date'] = datetime.now().strftime('%Y-%m-%d')
-        
-        # Process and analyze data - with error handling
-        try:
-            processed_data = analysis_service.process_data(df)
-        except Exception as e:
-            # If processing fails, create default processed data
-            processed_data = {
-                "total_transactions": len(df),
-                "total_amount": float(df['amount'].sum()) if 'amount' in df.columns else 0.0,
-                "date_range": {
-                    "start": datetime.now().strftime('%Y-%m-%d'),
-                    "end": datetime.now().strftime('%Y-%m-%d')
-                },
-                "transactions": valid_transactions
-            }
-            all_file_warnings.append({
-                'filename': 'system',
-                'warnings': [f"Data processing warning: {str(e)}"]
-            })
-        
-        try:
-            categorized_data = analysis_service.categorize_expenses(df)
-        except Exception as e:
-            # Default categorized data
-            categorized_data = {
-                "categories": {},
-                "category_totals": {},
-                "category_percentages": {},
-                "total_amount": processed_data.get("total_amount", 0),
-                "transaction_count": len(df)
-            }
-        
-        try:
-            insights = analysis_service.generate_spending_insights(categorized_data)
-        except Exception as e:
-            insights = {
-                "top_category": {"name": "Other", "percentage": 0, "amount": 0},
-                "category_breakdown": {},
-                "total_spent": processed_data.get("total_amount", 0),
-                "transaction_count": len(df)
-            }
-        
-        try:
-            visualizations = analysis_service.generate_visualization_data(categorized_data)
-        except Exception as e:
-            visualizations = {
-                "pie_chart": [],
-                "bar_chart": [],
-                "summary_stats": {"total_categories": 0, "largest_category": None, "smallest_category": None}
-            }
-        
-        try:
-            smart_score = scoring_service.calculate_smart_score(categorized_data)
-        except Exception as e:
-            smart_score = {
-                "score": 5.0,
-                "max_score": 10.0,
-                "spender_rating": "Moderate Spender",
-                "components": {},
-                "savings_bonus": 0,
-                "interpretation": "Analysis completed",
-                "recommendations": []
-            }
+                'date': today_str
+            }])
+        
+        # Process and analyze data - a stage that fails falls back to its default result
+        results = {}
+        stages = (
+            ('processed_data', lambda: analysis_service.process_data(df)),
+            ('categorized_data', lambda: analysis_service.categorize_expenses(df)),
+            ('insights', lambda: analysis_service.generate_spending_insights(results['categorized_data'])),
+            ('visualizations', lambda: analysis_service.generate_visualization_data(results['categorized_data'])),
+            ('smart_score', lambda: scoring_service.calculate_smart_score(results['categorized_data'])),
+        )
+        for name, stage in stages:
+            try:
+                results[name] = stage()
+            except Exception as e:
+                results[name] = _default_analysis_results(df, results.get('processed_data'), today_str)[name]
+                if name == 'processed_data':
+                    all_file_warnings.append({
+                        'filename': 'system',
+                        'warnings': [f"Data processing warning: {str(e)}"]
+                    })
+        processed_data = results['processed_data']
+        insights = results['insights']
+        visualizations = results['visualizations']
+        smart_score = results['smart_score']
         
         # Prepare analysis result
         analysis_result = {
@@ -812,35 +978,35 @@ async def analyze_company_files(
             "smart_score": smart_score,
             "file_errors": all_file_errors,
             "file_warnings": all_file_warnings,
-            "id": f"analysis_{datetime.now().timestamp()}"
+            "id": f"analysis_{now.timestamp()}"
         }
         
         # Save to history
         try:
-            analysis_id = history_service.save_analysis(user_id, "company", analysis_result)
+            analysis_id = history_service.enqueue_analysis(user_id, "company", analysis_result)
             analysis_result["id"] = analysis_id
         except Exception:
             # If history save fails, continue anyway
             pass
         
-        return JSONResponse(content=analysis_result)
+        return ORJSONResponse(content=analysis_result)
         
     except HTTPException:
         raise
     except Exception as e:
         # Even if everything fails, return a basic result
         try:
-            return JSONResponse(content={
+            return ORJSONResponse(content={
                 "total_transactions": 0,
                 "total_amount": 0,
-                "date_range": {"start": datetime.now().strftime('%Y-%m-%d'), "end": datetime.now().strftime('%Y-%m-%d')},
+                "date_range": {"start": today_str, "end": today_str},
                 "transactions": [],
                 "insights": {"total_spent": 0, "transaction_count": 0, "top_category": {"name": "Other", "percentage": 0, "amount": 0}, "category_breakdown": {}},
                 "visualizations": {"pie_chart": [], "bar_chart": []},
                 "smart_score": {"score": 5.0, "spender_rating": "Moderate Spender", "interpretation": "Analysis completed", "recommendations": []},
                 "file_errors": [],
                 "file_warnings": [{"filename": "unknown", "warnings": [f"Error during analysis: {str(e)}"]}],
-                "id": f"analysis_{datetime.now().timestamp()}"
+                "id": f"analysis_{now.timestamp()}"
             })
         except:
             # Last resort - return minimal response
@@ -852,7 +1018,7 @@ async def get_company_history(user_id: str):
     """Get analysis history for a company user"""
     try:
         history = history_service.get_user_history(user_id, account_type="company")
-        return JSONResponse(content={"status": "success", "history": history})
+        return ORJSONResponse(content={"status": "success", "history": history})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching history: {str(e)}")
 
@@ -883,96 +1049,272 @@ async def generate_company_report(data: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=f"Error generating report: {str(e)}")
 
 
-def generate_pie_chart(category_breakdown, output_path):
-    """Generate a pie chart for category breakdown"""
+_CHART_LOCK = threading.Lock()
+
+# Report charts are re-compressed when embedded in the PDF, so a light deflate is enough
+_CHART_PNG_OPTIONS = {'compress_level': 1, 'optimize': False}
+
+
+@functools.lru_cache(maxsize=None)
+def _chart_figure(figsize):
+    """Create a reusable Agg figure of the given size on first use (guard with _CHART_LOCK)"""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def _top_k_indices(values, k):
+    """Indices of the k largest values, largest first; ties keep their input order"""
+    keys = -values
+    if k <= 0 or k >= keys.shape[0]:
+        return np.argsort(keys, kind='mergesort')[:k]
+    # Partial selection: only values tied with or above the k-th largest get sorted
+    threshold = np.partition(keys, k - 1)[k - 1]
+    candidates = np.flatnonzero(keys <= threshold)
+    return candidates[np.argsort(keys[candidates], kind='mergesort')[:k]]
+
+
+if NUMBA_AVAILABLE:
+    _top_k_indices = njit(cache=True)(_top_k_indices)
+
+
+_CATEGORY_AMOUNT, _CATEGORY_PERCENTAGE = 1, 2
+
+
+def _category_rows(category_breakdown):
+    """Project a category breakdown once into (name, amount, percentage) tuples"""
+    return [(name, data.get('amount', 0), data.get('percentage', 0))
+            for name, data in category_breakdown.items()]
+
+
+def _top_categories(cat_rows, k, column=_CATEGORY_AMOUNT):
+    """Return the k category rows with the largest value in column, largest first"""
+    values = np.fromiter((row[column] for row in cat_rows), dtype=np.float64, count=len(cat_rows))
+    return [cat_rows[i] for i in _top_k_indices(values, k)]
+
+
+def _categories_by_amount(category_breakdown):
+    """Category rows ordered by amount, largest first - sorted once, then sliced by each consumer"""
+    cat_rows = _category_rows(category_breakdown)
+    return _top_categories(cat_rows, len(cat_rows))
+
+
+def generate_pie_chart(cat_rows, output_path):
+    """Generate a pie chart from category rows ordered by amount (see _categories_by_amount)"""
     try:
-        if not category_breakdown:
+        if not cat_rows:
             return None
         
-        sorted_categories = sorted(
-            category_breakdown.items(),
-            key=lambda x: x[1].get('amount', 0),
-            reverse=True
-        )[:8]  # Top 8 categories
+        sorted_categories = cat_rows[:8]  # Top 8 categories
         
         if not sorted_categories:
             return None
         
         labels = [cat[0] for cat in sorted_categories]
-        amounts = [cat[1].get('amount', 0) for cat in sorted_categories]
+        amounts = [cat[_CATEGORY_AMOUNT] for cat in sorted_categories]
         colors_list = ['#2563eb', '#10b981', '#f59e0b', '#ef4444', '#8b5cf6', 
                        '#ec4899', '#06b6d4', '#84cc16']
         
-        fig, ax = plt.subplots(figsize=(8, 8))
-        wedges, texts, autotexts = ax.pie(
-            amounts,
-            labels=labels,
-            autopct='%1.1f%%',
-            colors=colors_list[:len(labels)],
-            startangle=90,
-            textprops={'fontsize': 10, 'weight': 'bold'}
-        )
-        
-        # Make percentage text larger and bold
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontsize(11)
-            autotext.set_weight('bold')
-        
-        ax.set_title('Spending by Category', fontsize=16, fontweight='bold', pad=20)
-        plt.tight_layout()
-        plt.savefig(output_path, format='png', dpi=150, bbox_inches='tight', 
-                   facecolor='white', edgecolor='none')
-        plt.close()
+        with _CHART_LOCK:
+            fig = _chart_figure((8, 8))
+            fig.clear()
+            ax = fig.add_subplot(111)
+            wedges, texts, autotexts = ax.pie(
+                amounts,
+                labels=labels,
+                autopct='%1.1f%%',
+                colors=colors_list[:len(labels)],
+                startangle=90,
+                textprops={'fontsize': 10, 'weight': 'bold'}
+            )
+            
+            # Make percentage text larger and bold
+            for autotext in autotexts:
+                autotext.set_color('white')
+                autotext.set_fontsize(11)
+                autotext.set_weight('bold')
+            
+            ax.set_title('Spending by Category', fontsize=16, fontweight='bold', pad=20)
+            fig.tight_layout()
+            fig.savefig(output_path, format='png', dpi=150, bbox_inches='tight',
+                        facecolor='white', edgecolor='none', pil_kwargs=_CHART_PNG_OPTIONS)
         return True
     except Exception as e:
         print(f"Error generating pie chart: {str(e)}")
         return None
 
-def generate_bar_chart(category_breakdown, output_path):
-    """Generate a bar chart for top categories"""
+def generate_bar_chart(cat_rows, output_path):
+    """Generate a bar chart for top categories from rows ordered by amount (see _categories_by_amount)"""
     try:
-        if not category_breakdown:
+        if not cat_rows:
             return None
         
-        sorted_categories = sorted(
-            category_breakdown.items(),
-            key=lambda x: x[1].get('amount', 0),
-            reverse=True
-        )[:10]  # Top 10 categories
+        sorted_categories = cat_rows[:10]  # Top 10 categories
         
         if not sorted_categories:
             return None
         
         categories = [cat[0][:20] for cat in sorted_categories]  # Truncate long names
-        amounts = [cat[1].get('amount', 0) for cat in sorted_categories]
-        
-        fig, ax = plt.subplots(figsize=(10, 6))
-        bars = ax.barh(categories, amounts, color='#2563eb', edgecolor='#1e40af', linewidth=1)
-        
-        # Add value labels on bars
-        for i, (bar, amount) in enumerate(zip(bars, amounts)):
-            width = bar.get_width()
-            ax.text(width, bar.get_y() + bar.get_height()/2, 
-                   f'₹{amount:,.2f}',
-                   ha='left', va='center', fontweight='bold', fontsize=10)
+        amounts = [cat[_CATEGORY_AMOUNT] for cat in sorted_categories]
         
-        ax.set_xlabel('Amount (₹)', fontsize=12, fontweight='bold')
-        ax.set_title('Top Spending Categories', fontsize=14, fontweight='bold', pad=20)
-        ax.grid(axis='x', alpha=0.3, linestyle='--')
-        ax.set_axisbelow(True)
-        plt.tight_layout()
-        plt.savefig(output_path, format='png', dpi=150, bbox_inches='tight',
-                   facecolor='white', edgecolor='none')
-        plt.close()
+        with _CHART_LOCK:
+            fig = _chart_figure((10, 6))
+            fig.clear()
+            ax = fig.add_subplot(111)
+            bars = ax.barh(categories, amounts, color='#2563eb', edgecolor='#1e40af', linewidth=1)
+            
+            # Add value labels on bars
+            for i, (bar, amount) in enumerate(zip(bars, amounts)):
+                width = bar.get_width()
+                ax.text(width, bar.get_y() + bar.get_height()/2, 
+                       f'₹{amount:,.2f}',
+                       ha='left', va='center', fontweight='bold', fontsize=10)
+            
+            ax.set_xlabel('Amount (₹)', fontsize=12, fontweight='bold')
+            ax.set_title('Top Spending Categories', fontsize=14, fontweight='bold', pad=20)
+            ax.grid(axis='x', alpha=0.3, linestyle='--')
+            ax.set_axisbelow(True)
+            fig.tight_layout()
+            fig.savefig(output_path, format='png', dpi=150, bbox_inches='tight',
+                        facecolor='white', edgecolor='none', pil_kwargs=_CHART_PNG_OPTIONS)
         return True
     except Exception as e:
         print(f"Error generating bar chart: {str(e)}")
         return None
 
+@functools.lru_cache(maxsize=None)
+def _company_report_styles():
+    """Build the company report paragraph and table styles once, on first use"""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import TableStyle
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    styles = getSampleStyleSheet()
+    return {
+        'normal': styles['Normal'],
+        'header': ParagraphStyle(
+            'HeaderStyle', parent=styles['Heading1'],
+            fontSize=24, textColor=colors.HexColor('#2563eb'),
+            alignment=TA_CENTER, fontName='Helvetica-Bold',
+            spaceAfter=10
+        ),
+        'title': ParagraphStyle(
+            'TitleStyle', parent=styles['Heading1'],
+            fontSize=18, textColor=colors.black,
+            alignment=TA_CENTER, fontName='Helvetica-Bold',
+            spaceAfter=20
+        ),
+        'heading': ParagraphStyle(
+            'HeadingStyle', parent=styles['Heading2'],
+            fontSize=14, textColor=colors.HexColor('#1e40af'),
+            spaceAfter=12, spaceBefore=12,
+            fontName='Helvetica-Bold'
+        ),
+        'footer': ParagraphStyle(
+            'FooterStyle', parent=styles['Normal'],
+            fontSize=8, textColor=colors.grey,
+            alignment=TA_CENTER, spaceBefore=20
+        ),
+        'metadata_table': TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f3f4f6')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ]),
+        'summary_table': TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#eff6ff')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+            ('TOPPADDING', (0, 0), (-1, -1), 10),
+        ]),
+        'score_table': TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0fdf4')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+            ('TOPPADDING', (0, 0), (-1, -1), 10),
+        ]),
+        'category_table': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+            ('ALIGN', (2, 0), (-1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('TOPPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 10),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+            ('TOPPADDING', (0, 1), (-1, -1), 8),
+        ]),
+        'quality_table': TableStyle([
+            ('BACKGROUND', (0, 0), (0, 0), colors.HexColor('#fee2e2')),
+            ('BACKGROUND', (0, 1), (0, 1), colors.HexColor('#fef3c7')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ]),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _personal_report_styles():
+    """Build the personal report paragraph styles once, on first use"""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER, TA_LEFT
+    styles = getSampleStyleSheet()
+    return {
+        'subtitle': styles['Heading2'],
+        'header': ParagraphStyle(
+            'HeaderStyle', parent=styles['Heading1'],
+            fontSize=28, textColor=colors.HexColor('#2563eb'),
+            alignment=TA_CENTER, fontName='Helvetica-Bold',
+            spaceAfter=10
+        ),
+        'normal': ParagraphStyle(
+            'NormalStyle', parent=styles['Normal'],
+            fontSize=11, textColor=colors.black,
+            alignment=TA_LEFT, fontName='Helvetica',
+            leading=14
+        ),
+        'footer': ParagraphStyle(
+            'FooterStyle', parent=styles['Normal'],
+            fontSize=8, textColor=colors.grey,
+            alignment=TA_CENTER, spaceBefore=20
+        ),
+    }
+
+
 @app.get("/api/company/report/{analysis_id}")
 async def download_company_report(analysis_id: str):
     """Download PDF report for a specific analysis"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
     try:
         analysis = history_service.get_analysis_by_id(analysis_id)
         if not analysis:
@@ -983,25 +1325,14 @@ async def download_company_report(analysis_id: str):
         doc = SimpleDocTemplate(buffer, pagesize=letter,
                                 rightMargin=72, leftMargin=72,
                                 topMargin=72, bottomMargin=72)
-        
-        # Container for the 'Flowable' objects
-        elements = []
-        styles = getSampleStyleSheet()
-        
-        # Simple header
-        header_style = ParagraphStyle(
-            'HeaderStyle', parent=styles['Heading1'],
-            fontSize=24, textColor=colors.HexColor('#2563eb'),
-            alignment=TA_CENTER, fontName='Helvetica-Bold',
-            spaceAfter=10
-        )
-        elements.append(Paragraph("OpenAudit", header_style))
-        elements.append(Paragraph("Financial Analysis Report", ParagraphStyle(
-            'TitleStyle', parent=styles['Heading1'],
-            fontSize=18, textColor=colors.black,
-            alignment=TA_CENTER, fontName='Helvetica-Bold',
-            spaceAfter=20
-        )))
+        
+        # Container for the 'Flowable' objects
+        elements = []
+        styles = _company_report_styles()
+        
+        # Simple header
+        elements.append(Paragraph("OpenAudit", styles['header']))
+        elements.append(Paragraph("Financial Analysis Report", styles['title']))
         elements.append(Spacer(1, 0.3*inch))
         
         # Report metadata
@@ -1020,27 +1351,12 @@ async def download_company_report(analysis_id: str):
             ['Report Date:', formatted_date],
         ]
         metadata_table = Table(metadata_data, colWidths=[2*inch, 4*inch])
-        metadata_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f3f4f6')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ]))
+        metadata_table.setStyle(styles['metadata_table'])
         elements.append(metadata_table)
         elements.append(Spacer(1, 0.3*inch))
         
         # Executive Summary
-        heading_style = ParagraphStyle(
-            'HeadingStyle', parent=styles['Heading2'],
-            fontSize=14, textColor=colors.HexColor('#1e40af'),
-            spaceAfter=12, spaceBefore=12,
-            fontName='Helvetica-Bold'
-        )
+        heading_style = styles['heading']
         elements.append(Paragraph("Executive Summary", heading_style))
         smart_score = analysis.get('smart_score', {})
         insights_summary = analysis.get('insights_summary', {})
@@ -1053,16 +1369,7 @@ async def download_company_report(analysis_id: str):
             ['Date Range:', f"{date_range.get('start', 'N/A')} to {date_range.get('end', 'N/A')}"],
         ]
         summary_table = Table(summary_data, colWidths=[2.5*inch, 3.5*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#eff6ff')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 10),
-        ]))
+        summary_table.setStyle(styles['summary_table'])
         elements.append(summary_table)
         elements.append(Spacer(1, 0.3*inch))
         
@@ -1076,61 +1383,31 @@ async def download_company_report(analysis_id: str):
             ['Rating:', rating],
         ]
         score_table = Table(score_data, colWidths=[2.5*inch, 3.5*inch])
-        score_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0fdf4')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 10),
-        ]))
+        score_table.setStyle(styles['score_table'])
         elements.append(score_table)
         elements.append(Spacer(1, 0.3*inch))
         
         # Category Breakdown
         elements.append(Paragraph("Spending Categories", heading_style))
-        category_breakdown = insights_summary.get('category_breakdown', {})
+        cat_rows = _categories_by_amount(insights_summary.get('category_breakdown', {}))
         top_category = insights_summary.get('top_category', {})
         
-        if category_breakdown:
+        if cat_rows:
             category_data = [['Category', 'Amount', 'Percentage']]
-            sorted_categories = sorted(
-                category_breakdown.items(),
-                key=lambda x: x[1].get('amount', 0),
-                reverse=True
-            )[:10]  # Top 10 categories
+            sorted_categories = cat_rows[:10]  # Top 10 categories
             
-            for cat_name, cat_data in sorted_categories:
+            for cat_name, cat_amount, cat_pct in sorted_categories:
                 category_data.append([
                     cat_name,
-                    f"{rupee_symbol}{cat_data.get('amount', 0):,.2f}",
-                    f"{cat_data.get('percentage', 0):.1f}%"
+                    f"{rupee_symbol}{cat_amount:,.2f}",
+                    f"{cat_pct:.1f}%"
                 ])
             
             category_table = Table(category_data, colWidths=[3*inch, 1.5*inch, 1.5*inch])
-            category_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
-                ('ALIGN', (2, 0), (-1, -1), 'RIGHT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('TOPPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 10),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
-                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-                ('TOPPADDING', (0, 1), (-1, -1), 8),
-            ]))
+            category_table.setStyle(styles['category_table'])
             elements.append(category_table)
         else:
-            elements.append(Paragraph("No category data available.", styles['Normal']))
+            elements.append(Paragraph("No category data available.", styles['normal']))
         
         elements.append(Spacer(1, 0.3*inch))
         
@@ -1145,41 +1422,25 @@ async def download_company_report(analysis_id: str):
                 ['Warnings:', str(len(file_warnings))],
             ]
             quality_table = Table(quality_data, colWidths=[2.5*inch, 3.5*inch])
-            quality_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (0, 0), colors.HexColor('#fee2e2')),
-                ('BACKGROUND', (0, 1), (0, 1), colors.HexColor('#fef3c7')),
-                ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ]))
+            quality_table.setStyle(styles['quality_table'])
             elements.append(quality_table)
             elements.append(Spacer(1, 0.2*inch))
         
         # Footer with copyright
         elements.append(Spacer(1, 0.5*inch))
-        footer_style = ParagraphStyle(
-            'FooterStyle', parent=styles['Normal'],
-            fontSize=8, textColor=colors.grey,
-            alignment=TA_CENTER, spaceBefore=20
-        )
         current_year = datetime.now().year
         elements.append(Paragraph(
             f"© {current_year} OpenAudit. All rights reserved.<br/>"
             "This report is generated by OpenAudit financial analysis platform.",
-            footer_style
+            styles['footer']
         ))
         
-        # Build PDF
+        # Build PDF (ReportLab writes the finished document in a single write)
         doc.build(elements)
-        buffer.seek(0)
         
         # Return PDF
         return Response(
-            content=buffer.read(),
+            content=buffer.getvalue(),
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f'attachment; filename="Report_{analysis_id}.pdf"'
@@ -1211,20 +1472,15 @@ async def get_company_suggestions(data: Dict[str, Any]):
                 "priority": "high"
             })
         
-        category_breakdown = insights.get("category_breakdown", {})
-        categories = sorted(
-            [(cat, data) for cat, data in category_breakdown.items()],
-            key=lambda x: x[1].get("percentage", 0),
-            reverse=True
-        )
+        cat_rows = _category_rows(insights.get("category_breakdown", {}))
+        categories = _top_categories(cat_rows, 3, column=_CATEGORY_PERCENTAGE)
         
-        for cat_name, cat_data in categories[:3]:
-            pct = cat_data.get("percentage", 0)
+        for cat_name, cat_amount, pct in categories:
             if pct > 20:
                 suggestions.append({
                     "type": "info",
                     "title": f"Optimize {cat_name} Spending",
-                    "message": f"Your {cat_name} expenses account for {pct:.1f}% of total spending (₹{cat_data.get('amount', 0):,.2f}). Look for opportunities to reduce costs here.",
+                    "message": f"Your {cat_name} expenses account for {pct:.1f}% of total spending (₹{cat_amount:,.2f}). Look for opportunities to reduce costs here.",
                     "priority": "medium"
                 })
         
@@ -1254,7 +1510,7 @@ async def get_company_suggestions(data: Dict[str, Any]):
                 "priority": "low"
             })
         
-        return JSONResponse(content={"status": "success", "suggestions": suggestions})
+        return ORJSONResponse(content={"status": "success", "suggestions": suggestions})
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating suggestions: {str(e)}")
@@ -1289,64 +1545,85 @@ async def get_personal_history(user_id: str):
     """Get analysis history for a personal user"""
     try:
         history = history_service.get_user_history(user_id, account_type="personal")
-        return JSONResponse(content={"status": "success", "history": history})
+        return ORJSONResponse(content={"status": "success", "history": history})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching history: {str(e)}")
 
 
-@app.get("/api/personal/visualizations/{analysis_id}")
-async def get_personal_visualizations(analysis_id: str):
-    """Generate visualization images for personal analysis using matplotlib"""
-    try:
-        # Get the analysis from history
-        analysis = history_service.get_analysis_by_id(analysis_id)
-        
-        if not analysis:
-            raise HTTPException(status_code=404, detail="Analysis not found")
-        
-        # Get visualization data
-        visualizations = analysis.get('visualizations', {})
-        category_totals = {}
-        category_percentages = {}
-        
-        # Extract data from pie_chart or bar_chart format
-        pie_chart = visualizations.get('pie_chart', [])
-        bar_chart = visualizations.get('bar_chart', [])
-        
-        if pie_chart:
-            for item in pie_chart:
-                category_totals[item.get('name', 'Unknown')] = item.get('value', 0)
-        elif bar_chart:
-            for item in bar_chart:
-                category_totals[item.get('category', 'Unknown')] = item.get('amount', 0)
-                category_percentages[item.get('category', 'Unknown')] = item.get('percentage', 0)
-        
-        # If no visualization data, try to reconstruct from insights
-        if not category_totals and analysis.get('insights'):
-            category_breakdown = analysis.get('insights', {}).get('category_breakdown', {})
-            for category, data in category_breakdown.items():
-                category_totals[category] = data.get('amount', 0)
-                category_percentages[category] = data.get('percentage', 0)
-        
-        if not category_totals:
-            raise HTTPException(status_code=404, detail="No visualization data available")
-        
-        # Create output directory for charts
-        import tempfile
-        import base64
-        chart_dir = tempfile.mkdtemp()
-        
-        # Generate pie chart
-        pie_chart_path = os.path.join(chart_dir, 'pie_chart.png')
-        fig, ax = plt.subplots(figsize=(10, 8))
-        
-        categories = list(category_totals.keys())
-        amounts = list(category_totals.values())
-        
-        # Create pie chart with better styling
-        colors_list = ['#6366f1', '#8b5cf6', '#06b6d4', '#10b981', '#f59e0b', '#ef4444', '#ec4899', '#14b8a6', '#64748b', '#84cc16']
-        colors_cycle = colors_list * ((len(categories) // len(colors_list)) + 1)
-        
+PERSONAL_CHART_COLORS = ['#6366f1', '#8b5cf6', '#06b6d4', '#10b981', '#f59e0b', '#ef4444', '#ec4899', '#14b8a6', '#64748b', '#84cc16']
+
+# Chart images are keyed on analysis_id, so the browser may reuse them briefly
+PERSONAL_CHART_CACHE_CONTROL = "private, max-age=60"
+
+
+# Per-category totals of recently charted analyses: analysis id -> (history record, totals).
+# An entry is reused only while the history index still returns that same record object.
+_PERSONAL_TOTALS_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_PERSONAL_TOTALS_CACHE_SIZE = 128
+
+
+def _personal_category_totals(analysis_id: str) -> Dict[str, Any]:
+    """Look up a personal analysis and extract its per-category totals for charting"""
+    # Get the analysis from history
+    analysis = history_service.get_analysis_by_id(analysis_id)
+    
+    if not analysis:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    
+    # The dashboard asks for the JSON and both charts, so the same totals are needed three times
+    cached = _PERSONAL_TOTALS_CACHE.get(analysis_id)
+    if cached is not None and cached[0] is analysis:
+        _PERSONAL_TOTALS_CACHE.move_to_end(analysis_id)
+        return cached[1]
+    
+    # Get visualization data
+    visualizations = analysis.get('visualizations', {})
+    category_totals = {}
+    
+    # Extract data from pie_chart or bar_chart format
+    pie_chart = visualizations.get('pie_chart', [])
+    bar_chart = visualizations.get('bar_chart', [])
+    
+    if pie_chart:
+        for item in pie_chart:
+            category_totals[item.get('name', 'Unknown')] = item.get('value', 0)
+    elif bar_chart:
+        for item in bar_chart:
+            category_totals[item.get('category', 'Unknown')] = item.get('amount', 0)
+    
+    # If no visualization data, try to reconstruct from insights
+    if not category_totals and analysis.get('insights'):
+        category_breakdown = analysis.get('insights', {}).get('category_breakdown', {})
+        for category, data in category_breakdown.items():
+            category_totals[category] = data.get('amount', 0)
+    
+    if not category_totals:
+        raise HTTPException(status_code=404, detail="No visualization data available")
+    
+    _PERSONAL_TOTALS_CACHE[analysis_id] = (analysis, category_totals)
+    _PERSONAL_TOTALS_CACHE.move_to_end(analysis_id)
+    if len(_PERSONAL_TOTALS_CACHE) > _PERSONAL_TOTALS_CACHE_SIZE:
+        _PERSONAL_TOTALS_CACHE.popitem(last=False)
+    
+    return category_totals
+
+
+def _render_personal_pie_chart(category_totals: Dict[str, Any]) -> bytes:
+    """Render the spending distribution pie chart as SVG"""
+    # Charts are rendered straight into memory as SVG, no temp files or rasterization
+    pie_buffer = io.BytesIO()
+    
+    categories = list(category_totals.keys())
+    amounts = list(category_totals.values())
+    
+    # Create pie chart with better styling
+    colors_cycle = PERSONAL_CHART_COLORS * ((len(categories) // len(PERSONAL_CHART_COLORS)) + 1)
+    
+    # Object-oriented Agg API on a shared figure, so no pyplot global state is involved
+    with _CHART_LOCK:
+        fig = _chart_figure((10, 8))
+        fig.clear()
+        ax = fig.add_subplot(111)
         wedges, texts, autotexts = ax.pie(
             amounts,
             labels=categories,
@@ -1357,53 +1634,62 @@ async def get_personal_visualizations(analysis_id: str):
         )
         
         ax.set_title('Spending Distribution by Category', fontsize=16, fontweight='bold', pad=20)
-        plt.tight_layout()
-        plt.savefig(pie_chart_path, format='png', dpi=150, bbox_inches='tight', facecolor='white')
-        plt.close()
-        
-        # Generate bar chart
-        bar_chart_path = os.path.join(chart_dir, 'bar_chart.png')
-        fig, ax = plt.subplots(figsize=(12, 6))
-        
-        # Sort by amount descending
-        sorted_data = sorted(zip(categories, amounts), key=lambda x: x[1], reverse=True)
-        sorted_categories = [cat for cat, _ in sorted_data]
-        sorted_amounts = [amt for _, amt in sorted_data]
-        
+        fig.tight_layout()
+        fig.savefig(pie_buffer, format='svg', facecolor='white', metadata={'Date': None})
+    return pie_buffer.getvalue()
+
+
+def _render_personal_bar_chart(category_totals: Dict[str, Any]) -> bytes:
+    """Render the top spending categories bar chart as SVG"""
+    bar_buffer = io.BytesIO()
+    
+    categories = list(category_totals.keys())
+    colors_cycle = PERSONAL_CHART_COLORS * ((len(categories) // len(PERSONAL_CHART_COLORS)) + 1)
+    
+    # Sort by amount descending (stable, so equal amounts keep their order)
+    amounts_np = np.asarray(list(category_totals.values()), dtype=np.float64)
+    order = _top_k_indices(amounts_np, len(amounts_np))
+    sorted_categories = [categories[i] for i in order]
+    sorted_amounts = amounts_np[order]
+    
+    with _CHART_LOCK:
+        fig = _chart_figure((12, 6))
+        fig.clear()
+        ax = fig.add_subplot(111)
         # Create bar chart
-        bars = ax.barh(sorted_categories, sorted_amounts, color=colors_cycle[:len(sorted_categories)])
+        ax.barh(sorted_categories, sorted_amounts, color=colors_cycle[:len(sorted_categories)])
         
-        # Add value labels on bars
-        for i, (bar, amount) in enumerate(zip(bars, sorted_amounts)):
-            width = bar.get_width()
-            ax.text(width, bar.get_y() + bar.get_height()/2, 
+        # Add value labels on bars; bar i is centred on y=i, its width is the amount
+        for y, amount in enumerate(sorted_amounts):
+            ax.text(amount, y,
                    f'₹{amount:,.2f}',
                    ha='left', va='center', fontweight='bold', fontsize=10)
         
         ax.set_xlabel('Amount (₹)', fontsize=12, fontweight='bold')
         ax.set_title('Top Spending Categories', fontsize=14, fontweight='bold', pad=20)
         ax.grid(axis='x', alpha=0.3, linestyle='--')
-        plt.tight_layout()
-        plt.savefig(bar_chart_path, format='png', dpi=150, bbox_inches='tight', facecolor='white')
-        plt.close()
-        
-        # Read images and convert to base64
-        with open(pie_chart_path, 'rb') as f:
-            pie_image = base64.b64encode(f.read()).decode('utf-8')
-        
-        with open(bar_chart_path, 'rb') as f:
-            bar_image = base64.b64encode(f.read()).decode('utf-8')
-        
-        # Clean up temp files
-        import shutil
-        shutil.rmtree(chart_dir)
-        
-        return JSONResponse(content={
-            "status": "success",
-            "pie_chart": f"data:image/png;base64,{pie_image}",
-            "bar_chart": f"data:image/png;base64,{bar_image}"
-        })
-        
+        fig.tight_layout()
+        fig.savefig(bar_buffer, format='svg', facecolor='white', metadata={'Date': None})
+    return bar_buffer.getvalue()
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_personal_chart(render, category_items: tuple) -> bytes:
+    """Render a personal chart once per distinct (ordered) set of category totals"""
+    return render(dict(category_items))
+
+
+async def _personal_chart_response(analysis_id: str, render) -> Response:
+    """Render one personal chart and serve it as an image the browser can cache"""
+    try:
+        category_totals = _personal_category_totals(analysis_id)
+        # Rendering is blocking, keep it off the event loop
+        image = await asyncio.to_thread(_cached_personal_chart, render, tuple(category_totals.items()))
+        return Response(
+            content=image,
+            media_type="image/svg+xml",
+            headers={"Cache-Control": PERSONAL_CHART_CACHE_CONTROL}
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -1412,6 +1698,80 @@ async def get_personal_visualizations(analysis_id: str):
         raise HTTPException(status_code=500, detail=f"Error generating visualizations: {str(e)}")
 
 
+@app.get("/api/personal/visualizations/{analysis_id}")
+async def get_personal_visualizations(analysis_id: str):
+    """Return the URLs of the matplotlib visualization images for a personal analysis"""
+    # Validate up front so a missing analysis still 404s here, not on the images
+    _personal_category_totals(analysis_id)
+    
+    return ORJSONResponse(content={
+        "status": "success",
+        "pie_chart": f"/api/personal/visualizations/{analysis_id}/pie.svg",
+        "bar_chart": f"/api/personal/visualizations/{analysis_id}/bar.svg"
+    })
+
+
+@app.get("/api/personal/visualizations/{analysis_id}/pie.svg")
+async def get_personal_pie_chart(analysis_id: str):
+    """Serve the spending distribution pie chart for a personal analysis"""
+    return await _personal_chart_response(analysis_id, _render_personal_pie_chart)
+
+
+@app.get("/api/personal/visualizations/{analysis_id}/bar.svg")
+async def get_personal_bar_chart(analysis_id: str):
+    """Serve the top spending categories bar chart for a personal analysis"""
+    return await _personal_chart_response(analysis_id, _render_personal_bar_chart)
+
+
+@functools.lru_cache(maxsize=256)
+def _build_personal_pdf(analysis_id: str, report_fields: tuple, current_year: int) -> bytes:
+    """Build the personal report PDF; cached, since it only depends on these fields"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    created_at, total_transactions, total_amount, score, spender_rating = report_fields
+    
+    # For now, return a simple PDF. In production, you might want to generate a full report
+    # similar to company reports but tailored for personal users
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter,
+                            rightMargin=72, leftMargin=72,
+                            topMargin=72, bottomMargin=72)
+    
+    elements = []
+    styles = _personal_report_styles()
+    
+    # Header
+    elements.append(Paragraph("OpenAudit", styles['header']))
+    elements.append(Spacer(1, 0.2*inch))
+    elements.append(Paragraph("Personal Financial Analysis Report", styles['subtitle']))
+    elements.append(Spacer(1, 0.3*inch))
+    
+    # Report Content
+    report_text = f"""
+    <b>Analysis ID:</b> {analysis_id}<br/>
+    <b>Date:</b> {created_at}<br/>
+    <b>Total Transactions:</b> {total_transactions}<br/>
+    <b>Total Amount:</b> ₹{total_amount:,.2f}<br/>
+    <b>Smart Score:</b> {score}/10<br/>
+    <b>Spender Rating:</b> {spender_rating}<br/>
+    """
+    
+    elements.append(Paragraph(report_text, styles['normal']))
+    elements.append(Spacer(1, 0.3*inch))
+    
+    # Footer
+    elements.append(Paragraph(
+        f"© {current_year} OpenAudit. All rights reserved.<br/>"
+        f"Analysis ID: {analysis_id}<br/>"
+        "This report is generated for personal use only.",
+        styles['footer']
+    ))
+    
+    doc.build(elements)
+    return buffer.getvalue()
+
+
 @app.get("/api/personal/report/{analysis_id}")
 async def download_personal_report(analysis_id: str):
     """Download PDF report for a personal analysis"""
@@ -1422,67 +1782,20 @@ async def download_personal_report(analysis_id: str):
         if not analysis:
             raise HTTPException(status_code=404, detail="Analysis not found")
         
-        # For now, return a simple PDF. In production, you might want to generate a full report
-        # similar to company reports but tailored for personal users
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter,
-                                rightMargin=72, leftMargin=72,
-                                topMargin=72, bottomMargin=72)
-        
-        elements = []
-        styles = getSampleStyleSheet()
-        
-        # Header
-        header_style = ParagraphStyle(
-            'HeaderStyle', parent=styles['Heading1'],
-            fontSize=28, textColor=colors.HexColor('#2563eb'),
-            alignment=TA_CENTER, fontName='Helvetica-Bold',
-            spaceAfter=10
-        )
-        elements.append(Paragraph("OpenAudit", header_style))
-        elements.append(Spacer(1, 0.2*inch))
-        elements.append(Paragraph("Personal Financial Analysis Report", styles['Heading2']))
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # Report Content
-        normal_style = ParagraphStyle(
-            'NormalStyle', parent=styles['Normal'],
-            fontSize=11, textColor=colors.black,
-            alignment=TA_LEFT, fontName='Helvetica',
-            leading=14
-        )
-        
-        report_text = f"""
-        <b>Analysis ID:</b> {analysis_id}<br/>
-        <b>Date:</b> {analysis.get('created_at', 'N/A')}<br/>
-        <b>Total Transactions:</b> {analysis.get('total_transactions', 0)}<br/>
-        <b>Total Amount:</b> ₹{analysis.get('total_amount', 0):,.2f}<br/>
-        <b>Smart Score:</b> {analysis.get('smart_score', {}).get('score', 'N/A')}/10<br/>
-        <b>Spender Rating:</b> {analysis.get('smart_score', {}).get('spender_rating', 'N/A')}<br/>
-        """
-        
-        elements.append(Paragraph(report_text, normal_style))
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # Footer
-        footer_style = ParagraphStyle(
-            'FooterStyle', parent=styles['Normal'],
-            fontSize=8, textColor=colors.grey,
-            alignment=TA_CENTER, spaceBefore=20
+        # The fields the report shows; any change to them (or a new year) builds a fresh PDF
+        smart_score = analysis.get('smart_score', {})
+        report_fields = (
+            analysis.get('created_at', 'N/A'),
+            analysis.get('total_transactions', 0),
+            analysis.get('total_amount', 0),
+            smart_score.get('score', 'N/A'),
+            smart_score.get('spender_rating', 'N/A'),
         )
-        current_year = datetime.now().year
-        elements.append(Paragraph(
-            f"© {current_year} OpenAudit. All rights reserved.<br/>"
-            f"Analysis ID: {analysis_id}<br/>"
-            "This report is generated for personal use only.",
-            footer_style
-        ))
-        
-        doc.build(elements)
-        buffer.seek(0)
+        # ReportLab layout is blocking, keep it off the event loop
+        pdf_bytes = await asyncio.to_thread(_build_personal_pdf, analysis_id, report_fields, datetime.now().year)
         
         return Response(
-            content=buffer.read(),
+            content=pdf_bytes,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f'attachment; filename="Personal_Report_{analysis_id}.pdf"'
@@ -1502,32 +1815,30 @@ async def login(data: Dict[str, Any]):
         username = data.get("username")
         password = data.get("password")
         
-        print(f"[LOGIN API] Received login request for: {username}")
+        logger.debug("[LOGIN API] Received login request for: %s", username)
         
         if not username or not password:
-            print(f"[LOGIN API] Missing username or password")
+            logger.debug("[LOGIN API] Missing username or password")
             raise HTTPException(status_code=400, detail="Username and password are required")
         
         result = auth_service.login(username, password)
         
-        print(f"[LOGIN API] Auth service result: {result.get('success')}")
+        logger.debug("[LOGIN API] Auth service result: success=%s", result.get('success'))
         
         if result["success"]:
-            print(f"[LOGIN API] Login successful, returning user: {result['user']}")
+            logger.debug("[LOGIN API] Login successful for user id: %s", result['user'].get('id'))
             return JSONResponse(content={
                 "status": "success",
                 "user": result["user"],
                 "message": result["message"]
             })
         else:
-            print(f"[LOGIN API] Login failed: {result.get('message')}")
+            logger.debug("[LOGIN API] Login failed: %s", result.get('message'))
             raise HTTPException(status_code=401, detail=result["message"])
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        print(f"[LOGIN API] Error during login: {str(e)}")
-        traceback.print_exc()
+        logger.exception("[LOGIN API] Error during login: %s", e)
         raise HTTPException(status_code=500, detail=f"Error during login: {str(e)}")
 
 
@@ -1610,29 +1921,27 @@ async def upload_file(
         if not file:
             raise HTTPException(status_code=400, detail="No file provided")
         
-        result = process_file(file)
+        result = await process_file(file)
         
         # Don't block on errors - process_file always returns at least one transaction
         # Errors are reported but don't stop processing
-        if not result['transactions']:
+        df = result['transactions']
+        if df.empty:
             raise HTTPException(status_code=400, detail="No transaction data could be extracted from the file")
         
-        # Convert transactions to DataFrame for initial processing
-        df = pd.DataFrame(result['transactions'])
-        
         # DEBUG: Log what we got from file processing
-        if len(df) > 0:
-            print(f"[UPLOAD DEBUG] Received {len(df)} transactions from file processing")
-            print(f"[UPLOAD DEBUG] Sample transaction: {df.iloc[0].to_dict() if len(df) > 0 else 'None'}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[UPLOAD DEBUG] Received %d transactions from file processing", len(df))
+            logger.debug("[UPLOAD DEBUG] Sample transaction: %s", df.iloc[0].to_dict())
             if 'amount' in df.columns:
-                total_from_file = float(df['amount'].sum())
-                non_zero_from_file = len(df[df['amount'] > 0])
-                print(f"[UPLOAD DEBUG] Total amount: {total_from_file}, Non-zero transactions: {non_zero_from_file}")
-                print(f"[UPLOAD DEBUG] Amount values: {df['amount'].tolist()[:10]}")
+                amt = df['amount'].to_numpy()
+                logger.debug("[UPLOAD DEBUG] Total amount: %s, Non-zero transactions: %d",
+                             float(amt.sum()), int((amt > 0).sum()))
+                logger.debug("[UPLOAD DEBUG] Amount values: %s", amt[:10].tolist())
         
         processed_data = analysis_service.process_data(df)
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "status": "success",
             "data": {
                 **processed_data,
@@ -1657,71 +1966,75 @@ async def analyze_data(data: Dict[str, Any]):
         if not transactions:
             raise HTTPException(status_code=400, detail="No transactions provided")
         
-        # Ensure transactions is a list of dicts with required fields
-        valid_transactions = []
-        for txn in transactions:
-            if isinstance(txn, dict):
-                # Extract amount - prefer amount_abs if available (from upload), otherwise use amount
-                amount_raw = txn.get('amount_abs') or txn.get('amount', 0)
-                try:
-                    amount = float(amount_raw)
-                    # Use absolute value for expenses (treat negative as positive)
-                    amount = abs(amount)
-                except (ValueError, TypeError):
-                    amount = 0.0
-                
-                txn_dict = {
-                    'amount': amount,  # Already absolute
-                    'description': str(txn.get('description', 'Unknown'))
-                }
-                if 'date' in txn and txn['date']:
-                    txn_dict['date'] = txn['date']
-                else:
-                    txn_dict['date'] = datetime.now().strftime('%Y-%m-%d')
-                valid_transactions.append(txn_dict)
+        today_str = datetime.now().strftime('%Y-%m-%d')
         
-        if not valid_transactions:
+        # Build the fields column by column from the raw transaction dicts
+        frame = pd.DataFrame([txn for txn in transactions if isinstance(txn, dict)])
+        
+        if len(frame) == 0:
             raise HTTPException(status_code=400, detail="No valid transactions found")
         
-        # Convert to DataFrame
-        df = pd.DataFrame(valid_transactions)
+        missing = pd.Series(np.nan, index=frame.index, dtype=object)
+        amount_raw = frame['amount'] if 'amount' in frame.columns else missing
+        # Prefer amount_abs when set (from upload), otherwise fall back to amount
+        if 'amount_abs' in frame.columns:
+            amount_abs = frame['amount_abs']
+            use_abs = amount_abs.notna() & (amount_abs != 0) & (amount_abs != '')
+            amount_raw = amount_abs.where(use_abs, amount_raw)
+        # Only parse/fill/abs when needed; upload payloads are usually float and non-negative
+        if not pd.api.types.is_numeric_dtype(amount_raw):
+            amount_raw = pd.to_numeric(amount_raw, errors='coerce')
+        amounts = amount_raw.to_numpy(dtype='float64')
+        nan_mask = np.isnan(amounts)
+        if nan_mask.any():
+            amounts = np.where(nan_mask, 0.0, amounts)
+        # Use absolute value for expenses (treat negative as positive)
+        if (amounts < 0).any():
+            amounts = np.abs(amounts)
+        
+        dates = frame['date'] if 'date' in frame.columns else missing
+        dates = dates.where(dates.notna() & (dates != '') & (dates != 0), today_str)
+        
+        descriptions = frame['description'] if 'description' in frame.columns else missing
+        
+        df = pd.DataFrame({
+            'amount': amounts,
+            'description': descriptions.fillna('Unknown').astype(str).to_numpy(dtype=object),
+            'date': dates.to_numpy(dtype=object)
+        })
         
         # Check if DataFrame is empty
         if len(df) == 0:
             raise HTTPException(status_code=400, detail="No valid transactions found after processing")
         
-        # Ensure amount column is numeric
-        df['amount'] = pd.to_numeric(df['amount'], errors='coerce')
-        df['amount'] = df['amount'].fillna(0)
-        # Already absolute from above, but ensure it's still absolute
-        df['amount'] = df['amount'].abs()
-        
         # DEBUG: Log transaction counts and totals before processing
-        total_before = float(df['amount'].sum())
-        non_zero_count = len(df[df['amount'] > 0])
-        print(f"[ANALYZE DEBUG] DataFrame: {len(df)} rows, total={total_before}, non-zero={non_zero_count}")
-        if len(df) > 0:
-            print(f"[ANALYZE DEBUG] First transaction: {df.iloc[0].to_dict()}")
-            print(f"[ANALYZE DEBUG] Amounts: {df['amount'].tolist()[:10]}")
+        # (amount is already numeric, non-null and absolute from construction)
+        if logger.isEnabledFor(logging.DEBUG):
+            amt = df['amount'].to_numpy()
+            logger.debug("[ANALYZE DEBUG] DataFrame: %d rows, total=%s, non-zero=%d",
+                         len(df), float(amt.sum()), int((amt > 0).sum()))
+            logger.debug("[ANALYZE DEBUG] First transaction: %s", df.iloc[0].to_dict())
+            logger.debug("[ANALYZE DEBUG] Amounts: %s", amt[:10].tolist())
         
         # Ensure date column exists and is datetime
         if 'date' not in df.columns:
-            df['date'] = datetime.now().strftime('%Y-%m-%d')
+            df['date'] = today_str
         else:
-            df['date'] = pd.to_datetime(df['date'], errors='coerce')
+            # Dates are normally YYYY-MM-DD; only rows that miss that format are parsed by inference
+            raw_dates = df['date']
+            parsed = pd.to_datetime(raw_dates, format='%Y-%m-%d', errors='coerce', cache=True)
+            mask = parsed.isna() & raw_dates.notna()
+            if mask.any():
+                parsed[mask] = pd.to_datetime(raw_dates[mask], errors='coerce')
+            df['date'] = parsed
             # Fill NaT with current date
             df['date'] = df['date'].fillna(pd.Timestamp.now())
         
-        # Debug: Log amount info
-        if len(df) > 0:
-            total = float(df['amount'].sum())
-            non_zero_count = len(df[df['amount'] > 0])
-            print(f"[DEBUG] DataFrame has {len(df)} transactions, total={total}, non-zero={non_zero_count}")
-        
-        # Process and analyze data
-        processed_data = analysis_service.process_data(df)
-        categorized_data = analysis_service.categorize_expenses(df)
-        insights = analysis_service.generate_spending_insights(categorized_data)
+        # Process and analyze data (one pass; the per-category transaction listings aren't needed)
+        analysis = analysis_service.analyze(df)
+        processed_data = analysis['processed_data']
+        categorized_data = analysis['categorized_data']
+        insights = analysis['insights']
         visualizations = analysis_service.generate_visualization_data(categorized_data)
         smart_score = scoring_service.calculate_smart_score(categorized_data)
         
@@ -1735,10 +2048,11 @@ async def analyze_data(data: Dict[str, Any]):
         }
         
         # DEBUG: Log final response structure
-        print(f"[ANALYZE FINAL] total_spent in insights: {insights_with_transactions.get('total_spent')}")
-        print(f"[ANALYZE FINAL] transaction_count: {insights_with_transactions.get('transaction_count')}")
-        print(f"[ANALYZE FINAL] total_amount from processed_data: {processed_data.get('total_amount')}")
-        print(f"[ANALYZE FINAL] insights keys: {list(insights_with_transactions.keys())}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[ANALYZE FINAL] total_spent in insights: %s", insights_with_transactions.get('total_spent'))
+            logger.debug("[ANALYZE FINAL] transaction_count: %s", insights_with_transactions.get('transaction_count'))
+            logger.debug("[ANALYZE FINAL] total_amount from processed_data: %s", processed_data.get('total_amount'))
+            logger.debug("[ANALYZE FINAL] insights keys: %s", list(insights_with_transactions.keys()))
         
         response_data = {
             "status": "success",
@@ -1749,7 +2063,7 @@ async def analyze_data(data: Dict[str, Any]):
             "report": report
         }
         
-        return JSONResponse(content=response_data)
+        return ORJSONResponse(content=response_data)
     except HTTPException:
         raise
     except Exception as e:
@@ -1782,7 +2096,7 @@ async def detect_bias(data: Dict[str, Any]):
         # Generate report
         report = nlg_service.generate_bias_report(result)
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "status": "success",
             **result,
             "report": report
@@ -1807,7 +2121,7 @@ async def get_user_data(user_id: str):
         personal_history = history_service.get_user_history(user_id, account_type="personal")
         company_history = history_service.get_user_history(user_id, account_type="company")
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "status": "success",
             "data": {
                 "user": user,
@@ -1828,143 +2142,231 @@ async def get_user_data(user_id: str):
 # Contract Endpoints
 # ============================================================================
 
-def generate_contract_pdf(company_name: str, contract_id: str) -> io.BytesIO:
-    """Generate contract PDF with OpenAudit branding"""
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter,
-                            rightMargin=72, leftMargin=72,
-                            topMargin=72, bottomMargin=72)
-    
-    elements = []
-    styles = getSampleStyleSheet()
-    
-    # Header with OpenAudit
-    header_style = ParagraphStyle(
-        'HeaderStyle', parent=styles['Heading1'],
-        fontSize=28, textColor=colors.HexColor('#2563eb'),
-        alignment=TA_CENTER, fontName='Helvetica-Bold',
-        spaceAfter=10
-    )
-    elements.append(Paragraph("OpenAudit", header_style))
-    elements.append(Spacer(1, 0.2*inch))
-    
-    # Contract Title
-    title_style = ParagraphStyle(
-        'TitleStyle', parent=styles['Heading1'],
-        fontSize=20, textColor=colors.black,
-        alignment=TA_CENTER, fontName='Helvetica-Bold',
-        spaceAfter=20
-    )
-    elements.append(Paragraph("DATA CONFIDENTIALITY AGREEMENT", title_style))
-    elements.append(Spacer(1, 0.3*inch))
-    
-    # Contract Content
-    normal_style = ParagraphStyle(
-        'NormalStyle', parent=styles['Normal'],
-        fontSize=11, textColor=colors.black,
-        alignment=TA_LEFT, fontName='Helvetica',
-        leading=14
-    )
-    
-    contract_text = f"""
-This Data Confidentiality Agreement ("Agreement") is entered into on {datetime.now().strftime("%B %d, %Y")} between OpenAudit ("Service Provider") and {company_name} ("Company").
-
-<b>1. CONFIDENTIAL INFORMATION</b><br/><br/>
+# Built contract templates, keyed on (company_name, contract_id, date, year) (LRU)
+_CONTRACT_PDF_CACHE: "OrderedDict[tuple, bytes]" = OrderedDict()
+_CONTRACT_PDF_CACHE_SIZE = 512
 
-For purposes of this Agreement, "Confidential Information" shall mean all financial data, transaction records, business information, and any other data provided by the Company to OpenAudit for the purpose of financial analysis and auditing services.
 
-<b>2. OBLIGATIONS OF OPENAUDIT</b><br/><br/>
+async def _contract_pdf(company_name: str, contract_id: str) -> bytes:
+    """Contract template PDF bytes, laid out in the process pool once per company, contract and day.
 
-OpenAudit agrees to:<br/>
-a) Hold all Confidential Information in strict confidence;<br/>
-b) Not disclose, share, or distribute any Confidential Information to any third party without prior written consent from the Company;<br/>
-c) Use Confidential Information solely for the purpose of providing financial analysis services to the Company;<br/>
-d) Implement reasonable security measures to protect Confidential Information from unauthorized access, disclosure, or use;<br/>
-e) Not use Confidential Information for any purpose other than providing services to the Company.<br/><br/>
+    Served from the in-memory LRU; today's copy on disk only seeds it after a restart, and a
+    fresh build is stored to disk for the next cold start.
+    """
+    now = datetime.now()
+    cache_key = (company_name, contract_id, now.strftime("%B %d, %Y"), now.year)
+    pdf_bytes = _CONTRACT_PDF_CACHE.get(cache_key)
+    if pdf_bytes is not None:
+        _CONTRACT_PDF_CACHE.move_to_end(cache_key)
+        return pdf_bytes
+    template_path = _contract_template_path(contract_id)
+    if _is_current_template(template_path):
+        pdf_bytes = await asyncio.to_thread(_read_contract_template, template_path)
+    else:
+        pdf_bytes = await _run_in_process_pool(_build_contract_pdf, *cache_key)
+        await asyncio.to_thread(_store_contract_template, template_path, pdf_bytes)
+    _CONTRACT_PDF_CACHE[cache_key] = pdf_bytes
+    if len(_CONTRACT_PDF_CACHE) > _CONTRACT_PDF_CACHE_SIZE:
+        _CONTRACT_PDF_CACHE.popitem(last=False)
+    return pdf_bytes
 
-<b>3. OBLIGATIONS OF COMPANY</b><br/><br/>
 
-The Company agrees to:<br/>
-a) Provide accurate and complete financial data for analysis;<br/>
-b) Inform OpenAudit of any changes to the data that may affect the analysis;<br/>
-c) Use the analysis results responsibly and in accordance with applicable laws and regulations.<br/><br/>
+def _contract_template_path(contract_id: str) -> str:
+    """On-disk copy of a contract's rendered template, next to its signed upload"""
+    return os.path.join("database/contracts", f"{contract_id}_template.pdf")
 
-<b>4. DATA RETENTION AND DESTRUCTION</b><br/><br/>
 
-OpenAudit will retain Confidential Information only as long as necessary to provide the requested services or as required by law. Upon termination of services, OpenAudit will either return or securely destroy all Confidential Information upon Company's request.
+def _is_current_template(path: str) -> bool:
+    """Whether a stored template exists and carries today's agreement date"""
+    try:
+        return datetime.fromtimestamp(os.path.getmtime(path)).date() == datetime.now().date()
+    except OSError:
+        return False
 
-<b>5. EXCEPTIONS</b><br/><br/>
 
-The obligations of confidentiality shall not apply to information that:<br/>
-a) Was already known to OpenAudit prior to disclosure;<br/>
-b) Is publicly available or becomes publicly available through no breach of this Agreement;<br/>
-c) Is required to be disclosed by law or court order.<br/><br/>
+def _read_contract_template(path: str) -> bytes:
+    """Stored template bytes, loaded once into the LRU on a cold start"""
+    with open(path, "rb") as f:
+        return f.read()
 
-<b>6. TERM</b><br/><br/>
 
-This Agreement shall remain in effect for the duration of the service relationship between OpenAudit and the Company, and shall continue to apply to Confidential Information disclosed during such relationship.
+def _store_contract_template(path: str, pdf_bytes: bytes):
+    """Write a rendered template atomically so concurrent downloads never see a partial file"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(pdf_bytes)
+    os.replace(tmp_path, path)
 
-<b>7. REMEDIES</b><br/><br/>
 
-In the event of a breach of this Agreement, the non-breaching party shall be entitled to seek all available remedies at law or in equity, including but not limited to injunctive relief.
+def _contract_canvas(buffer: io.BytesIO):
+    """Letter-size canvas the contract pages are drawn on"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+    return canvas.Canvas(buffer, pagesize=letter)
 
-<b>8. GOVERNING LAW</b><br/><br/>
 
-This Agreement shall be governed by and construed in accordance with applicable laws and regulations.
+def _build_contract_pdf(company_name: str, contract_id: str, agreement_date: str, current_year: int) -> bytes:
+    """Draw one contract; only the company, contract id and dates vary between builds"""
+    buffer = io.BytesIO()
+    pdf = _contract_canvas(buffer)
+    _draw_contract(pdf, company_name, contract_id, agreement_date, current_year)
+    pdf.save()
+    return buffer.getvalue()
 
-<b>9. ENTIRE AGREEMENT</b><br/><br/>
 
-This Agreement constitutes the entire agreement between the parties regarding the confidentiality of data and supersedes all prior agreements or understandings.
-"""
+def _build_contracts_batch_pdf(contracts: List[tuple], agreement_date: str, current_year: int) -> bytes:
+    """Draw several (company_name, contract_id) contracts as one PDF, one contract per page run"""
+    buffer = io.BytesIO()
+    pdf = _contract_canvas(buffer)
+    for company_name, contract_id in contracts:
+        _draw_contract(pdf, company_name, contract_id, agreement_date, current_year)
+    pdf.save()
+    return buffer.getvalue()
+
+
+# Contract clauses as (heading, body); the static text is wrapped once per process
+CONTRACT_CLAUSES: List[Tuple[str, str]] = [
+    ("1. CONFIDENTIAL INFORMATION",
+     'For purposes of this Agreement, "Confidential Information" shall mean all financial data, transaction records, business information, and any other data provided by the Company to OpenAudit for the purpose of financial analysis and auditing services.'),
+    ("2. OBLIGATIONS OF OPENAUDIT",
+     "OpenAudit agrees to:<br/>"
+     "a) Hold all Confidential Information in strict confidence;<br/>"
+     "b) Not disclose, share, or distribute any Confidential Information to any third party without prior written consent from the Company;<br/>"
+     "c) Use Confidential Information solely for the purpose of providing financial analysis services to the Company;<br/>"
+     "d) Implement reasonable security measures to protect Confidential Information from unauthorized access, disclosure, or use;<br/>"
+     "e) Not use Confidential Information for any purpose other than providing services to the Company."),
+    ("3. OBLIGATIONS OF COMPANY",
+     "The Company agrees to:<br/>"
+     "a) Provide accurate and complete financial data for analysis;<br/>"
+     "b) Inform OpenAudit of any changes to the data that may affect the analysis;<br/>"
+     "c) Use the analysis results responsibly and in accordance with applicable laws and regulations."),
+    ("4. DATA RETENTION AND DESTRUCTION",
+     "OpenAudit will retain Confidential Information only as long as necessary to provide the requested services or as required by law. Upon termination of services, OpenAudit will either return or securely destroy all Confidential Information upon Company's request."),
+    ("5. EXCEPTIONS",
+     "The obligations of confidentiality shall not apply to information that:<br/>"
+     "a) Was already known to OpenAudit prior to disclosure;<br/>"
+     "b) Is publicly available or becomes publicly available through no breach of this Agreement;<br/>"
+     "c) Is required to be disclosed by law or court order."),
+    ("6. TERM",
+     "This Agreement shall remain in effect for the duration of the service relationship between OpenAudit and the Company, and shall continue to apply to Confidential Information disclosed during such relationship."),
+    ("7. REMEDIES",
+     "In the event of a breach of this Agreement, the non-breaching party shall be entitled to seek all available remedies at law or in equity, including but not limited to injunctive relief."),
+    ("8. GOVERNING LAW",
+     "This Agreement shall be governed by and construed in accordance with applicable laws and regulations."),
+    ("9. ENTIRE AGREEMENT",
+     "This Agreement constitutes the entire agreement between the parties regarding the confidentiality of data and supersedes all prior agreements or understandings."),
+]
+
+
+CONTRACT_SIGNATURE_ROWS = [
+    ['Company Representative:', '___________________', 'OpenAudit Representative:', '___________________'],
+    ['Name:', '___________________', 'Name:', '___________________'],
+    ['Title:', '___________________', 'Title:', '___________________'],
+    ['Date:', '___________________', 'Date:', '___________________'],
+]
+
+# Contract page geometry in points: US letter with one-inch margins, 11pt body on 14pt lines
+CONTRACT_MARGIN = 72
+CONTRACT_BODY_WIDTH = 612 - 2 * CONTRACT_MARGIN
+CONTRACT_LEADING = 14
+
+
+@functools.lru_cache(maxsize=None)
+def _contract_clause_lines() -> tuple:
+    """Wrap the clause text once into (font name, line) pairs; a None font is a blank line"""
+    from reportlab.lib.utils import simpleSplit
     
-    elements.append(Paragraph(contract_text, normal_style))
-    elements.append(Spacer(1, 0.4*inch))
+    lines = []
+    for heading, body in CONTRACT_CLAUSES:
+        lines.append(('Helvetica-Bold', heading))
+        for part in body.split('<br/>'):
+            lines.extend(('Helvetica', line) for line in simpleSplit(part, 'Helvetica', 11, CONTRACT_BODY_WIDTH))
+        lines.append((None, ''))
+    return tuple(lines)
+
+
+def _draw_contract(pdf, company_name: str, contract_id: str, agreement_date: str, current_year: int):
+    """Draw one contract at fixed positions, from a fresh page through its last page"""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.lib.utils import simpleSplit
     
-    # Signature Section
-    signature_style = ParagraphStyle(
-        'SignatureStyle', parent=styles['Normal'],
-        fontSize=11, textColor=colors.black,
-        alignment=TA_LEFT, fontName='Helvetica-Bold'
-    )
+    page_width, page_height = letter
+    center = page_width / 2
+    top = page_height - CONTRACT_MARGIN
+    y = top
     
-    signature_data = [
-        ['Company Representative:', '___________________', 'OpenAudit Representative:', '___________________'],
-        ['Name:', '___________________', 'Name:', '___________________'],
-        ['Title:', '___________________', 'Title:', '___________________'],
-        ['Date:', '___________________', 'Date:', '___________________'],
-    ]
-    signature_table = Table(signature_data, colWidths=[1.5*inch, 2*inch, 1.5*inch, 2*inch])
-    signature_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('LEFTPADDING', (0, 0), (-1, -1), 5),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 5),
-    ]))
-    elements.append(signature_table)
-    elements.append(Spacer(1, 0.3*inch))
+    def next_line(height: float) -> float:
+        """Baseline for a line of this height, starting a new page when it doesn't fit"""
+        nonlocal y
+        if y - height < CONTRACT_MARGIN:
+            pdf.showPage()
+            y = top
+        y -= height
+        return y
     
-    # Footer
-    footer_style = ParagraphStyle(
-        'FooterStyle', parent=styles['Normal'],
-        fontSize=8, textColor=colors.grey,
-        alignment=TA_CENTER, spaceBefore=20
+    # Header with OpenAudit
+    pdf.setFillColor(colors.HexColor('#2563eb'))
+    pdf.setFont('Helvetica-Bold', 28)
+    pdf.drawCentredString(center, next_line(28), "OpenAudit")
+    y -= 10 + 0.2*inch
+    
+    # Contract Title
+    pdf.setFillColor(colors.black)
+    pdf.setFont('Helvetica-Bold', 20)
+    pdf.drawCentredString(center, next_line(20), "DATA CONFIDENTIALITY AGREEMENT")
+    y -= 20 + 0.3*inch
+    
+    # Contract Content: the intro is the only text wrapped per contract
+    intro = (
+        f'This Data Confidentiality Agreement ("Agreement") is entered into on {agreement_date} '
+        f'between OpenAudit ("Service Provider") and {company_name} ("Company").'
     )
-    current_year = datetime.now().year
-    elements.append(Paragraph(
-        f"© {current_year} OpenAudit. All rights reserved.<br/>"
-        f"Contract ID: {contract_id}<br/>"
+    lines = [('Helvetica', line) for line in simpleSplit(intro, 'Helvetica', 11, CONTRACT_BODY_WIDTH)]
+    lines.append((None, ''))
+    lines.extend(_contract_clause_lines())
+    for font, text in lines:
+        if font is None:
+            if y != top:
+                y -= CONTRACT_LEADING
+            continue
+        if font == 'Helvetica-Bold' and y - 2 * CONTRACT_LEADING < CONTRACT_MARGIN:
+            # Keep a clause heading on the same page as its first line
+            pdf.showPage()
+            y = top
+        baseline = next_line(CONTRACT_LEADING)
+        pdf.setFont(font, 11)
+        pdf.drawString(CONTRACT_MARGIN, baseline, text)
+    y -= 0.4*inch
+    
+    # Signature Section: columns of 1.5/2/1.5/2 inches centred on the page, kept on one page
+    row_height = 26
+    if y - row_height * len(CONTRACT_SIGNATURE_ROWS) < CONTRACT_MARGIN:
+        pdf.showPage()
+        y = top
+    left = center - 3.5*inch
+    column_offsets = [0, 1.5*inch, 3.5*inch, 5*inch]
+    for row in CONTRACT_SIGNATURE_ROWS:
+        for column, (offset, text) in enumerate(zip(column_offsets, row)):
+            pdf.setFont('Helvetica-Bold' if column == 0 else 'Helvetica', 10)
+            pdf.drawString(left + offset + 5, y - 18, text)
+        y -= row_height
+    y -= 0.3*inch + 20
+    
+    # Footer (a page break resets the canvas state, so colour and font are set per line)
+    for text in (
+        f"© {current_year} OpenAudit. All rights reserved.",
+        f"Contract ID: {contract_id}",
         "This contract is a legal agreement between OpenAudit and the Company.",
-        footer_style
-    ))
+    ):
+        baseline = next_line(12)
+        pdf.setFillColor(colors.grey)
+        pdf.setFont('Helvetica', 8)
+        pdf.drawCentredString(center, baseline, text)
     
-    doc.build(elements)
-    buffer.seek(0)
-    return buffer
+    pdf.showPage()
 
 @app.post("/api/company/contract/request")
 async def request_contract(data: Dict[str, Any]):
@@ -2016,6 +2418,59 @@ async def get_all_contracts():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching contracts: {str(e)}")
 
+@app.post("/api/admin/contracts/download-batch")
+async def download_contracts_batch(data: Dict[str, Any]):
+    """Download several contract templates as a single PDF for admin export"""
+    try:
+        contract_ids = data.get("contract_ids", [])
+        if not contract_ids:
+            raise HTTPException(status_code=400, detail="contract_ids are required")
+        
+        contracts = [contract_service.get_contract_by_id(cid) for cid in contract_ids]
+        missing = [cid for cid, contract in zip(contract_ids, contracts) if not contract]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Contracts not found: {', '.join(map(str, missing))}")
+        
+        entries = [(contract.get("company_name", "Company"), cid) for cid, contract in zip(contract_ids, contracts)]
+        now = datetime.now()
+        # One ReportLab pass for all contracts, in the process pool
+        batch_pdf = await _run_in_process_pool(_build_contracts_batch_pdf, entries, now.strftime("%B %d, %Y"), now.year)
+        
+        return Response(
+            content=batch_pdf,
+            media_type="application/pdf",
+            headers={
+                "Content-Disposition": 'attachment; filename="Contracts.pdf"'
+            }
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error downloading contracts: {str(e)}")
+
+UPLOAD_COPY_CHUNK_SIZE = 1 << 20
+
+
+def _save_upload(file: UploadFile, path: str) -> None:
+    """Copy an upload's spooled file to disk in fixed-size chunks, never holding it all in memory"""
+    source = file.file
+    source.seek(0)
+    with open(path, "wb") as f:
+        # Multipart uploads larger than Starlette's spool limit have been rolled over to a real
+        # temp file, so the kernel can copy it fd to fd; smaller ones are still in memory and
+        # are copied through Python with read/write calls
+        if file.size is not None and file.size > MultiPartParser.spool_max_size and hasattr(os, "sendfile"):
+            try:
+                in_fd = source.fileno()
+            except (OSError, io.UnsupportedOperation):
+                in_fd = None
+            if in_fd is not None:
+                out_fd, offset = f.fileno(), 0
+                while sent := os.sendfile(out_fd, in_fd, offset, UPLOAD_COPY_CHUNK_SIZE):
+                    offset += sent
+                return
+        shutil.copyfileobj(source, f, UPLOAD_COPY_CHUNK_SIZE)
+
 @app.post("/api/admin/contract/sign")
 async def sign_contract_admin(contract_id: str = Form(...), signature: str = Form(...), file: UploadFile = File(...)):
     """Admin signs and uploads the contract"""
@@ -2025,9 +2480,7 @@ async def sign_contract_admin(contract_id: str = Form(...), signature: str = For
         os.makedirs(contract_dir, exist_ok=True)
         file_path = os.path.join(contract_dir, f"{contract_id}_signed.pdf")
         
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        await asyncio.to_thread(_save_upload, file, file_path)
         
         contract = contract_service.sign_contract_admin(contract_id, signature, file_path)
         
@@ -2049,9 +2502,7 @@ async def update_signed_contract(contract_id: str = Form(...), file: UploadFile
         os.makedirs(contract_dir, exist_ok=True)
         file_path = os.path.join(contract_dir, f"{contract_id}_signed.pdf")
         
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        await asyncio.to_thread(_save_upload, file, file_path)
         
         contract = contract_service.update_signed_contract(contract_id, file_path)
         
@@ -2068,30 +2519,28 @@ async def update_signed_contract(contract_id: str = Form(...), file: UploadFile
 async def download_contract(contract_id: str, type: str = "template"):
     """Download contract (template or signed)"""
     try:
-        contracts = contract_service.get_all_contracts()
-        contract = next((c for c in contracts if c.get("id") == contract_id), None)
-        
-        if not contract:
-            raise HTTPException(status_code=404, detail="Contract not found")
-        
-        if type == "signed" and contract.get("signed_contract_pdf_path"):
+        signed_path = contract_service.get_signed_path(contract_id) if type == "signed" else None
+        if signed_path:
             # Return signed contract
-            if os.path.exists(contract["signed_contract_pdf_path"]):
+            if os.path.exists(signed_path):
                 return FileResponse(
-                    contract["signed_contract_pdf_path"],
+                    signed_path,
                     media_type="application/pdf",
                     filename=f"Contract_{contract_id}_Signed.pdf"
                 )
             else:
                 raise HTTPException(status_code=404, detail="Signed contract file not found")
         else:
-            # Generate and return template contract
+            contract = contract_service.get_contract_by_id(contract_id)
+            
+            if not contract:
+                raise HTTPException(status_code=404, detail="Contract not found")
+            
             company_name = contract.get("company_name", "Company")
-            contract_pdf = generate_contract_pdf(company_name, contract_id)
-            contract_pdf.seek(0)
+            contract_pdf = await _contract_pdf(company_name, contract_id)
             
             return Response(
-                content=contract_pdf.read(),
+                content=contract_pdf,
                 media_type="application/pdf",
                 headers={
                     "Content-Disposition": f'attachment; filename="Contract_{contract_id}.pdf"'
@@ -2134,6 +2583,27 @@ async def root():
 # AI AUDIT ENDPOINTS - Comprehensive Company Auditing
 # ============================================================================
 
+# Crockford base32, as used by ULIDs
+_AUDIT_ID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_AUDIT_ID_LOCK = threading.Lock()
+_last_audit_id = (0, 0)  # (millisecond timestamp, 80-bit random part) of the last id handed out
+
+
+def _new_audit_id() -> str:
+    """ULID-style audit id: 48-bit ms timestamp + 80 random bits, increasing within a millisecond"""
+    global _last_audit_id
+    with _AUDIT_ID_LOCK:
+        millis = time.time_ns() // 1_000_000
+        last_millis, last_random = _last_audit_id
+        if millis <= last_millis:
+            millis, random_part = last_millis, (last_random + 1) & ((1 << 80) - 1)
+        else:
+            random_part = int.from_bytes(os.urandom(10), "big")
+        _last_audit_id = (millis, random_part)
+    value = (millis << 80) | random_part
+    return "".join(_AUDIT_ID_ALPHABET[(value >> shift) & 31] for shift in range(125, -1, -5))
+
+
 @app.post("/api/company/audit")
 async def perform_company_audit(
     files: List[UploadFile] = File(...),
@@ -2170,14 +2640,13 @@ async def perform_company_audit(
             raise HTTPException(status_code=400, detail="user_id is required")
         
         # Process all uploaded files
-        all_transactions = []
+        transaction_frames = []
         all_file_errors = []
         all_file_warnings = []
         all_missing_values = []  # Store all missing value data
         
-        for file in files:
-            result = process_file(file)
-            
+        # Files parse concurrently in the process pool; results come back in upload order
+        for result in await process_files(files):
             if result['errors']:
                 all_file_errors.append({
                     'filename': result['filename'],
@@ -2194,36 +2663,31 @@ async def perform_company_audit(
             if result.get('missing_values'):
                 all_missing_values.extend(result['missing_values'])
             
-            all_transactions.extend(result['transactions'])
+            transaction_frames.append(result['transactions'])
         
-        # Validate and normalize transactions
-        valid_transactions = []
-        for txn in all_transactions:
-            if isinstance(txn, dict):
-                try:
-                    amount = float(txn.get('amount', 0))
-                    amount = abs(amount)
-                    valid_transactions.append({
-                        'amount': amount,
-                        'description': str(txn.get('description', 'Transaction')),
-                        'date': txn.get('date', datetime.now().strftime('%Y-%m-%d'))
-                    })
-                except:
-                    continue
+        all_transactions = pd.concat(transaction_frames, ignore_index=True)
         
-        if not valid_transactions:
-            raise HTTPException(status_code=400, detail="No valid transaction data found")
+        # Validate and normalize transactions column-wise; rows whose amount isn't numeric are dropped
+        amounts = pd.to_numeric(all_transactions['amount'], errors='coerce')
+        valid_rows = amounts.notna() | all_transactions['amount'].isna()
+        df = pd.DataFrame({
+            'amount': amounts[valid_rows].fillna(0).abs().to_numpy(dtype='float64'),
+            'description': all_transactions['description'][valid_rows].astype(str).to_numpy(dtype=object),
+            'date': all_transactions['date'][valid_rows].to_numpy(dtype=object)
+        }, columns=TRANSACTION_COLUMNS)
         
-        # Convert to DataFrame for analysis
-        df = pd.DataFrame(valid_transactions)
-        df['amount'] = pd.to_numeric(df['amount'], errors='coerce').fillna(0).abs()
+        if df.empty:
+            raise HTTPException(status_code=400, detail="No valid transaction data found")
         
-        # Perform financial analysis
-        processed_data = analysis_service.process_data(df)
-        categorized_data = analysis_service.categorize_expenses(df)
+        # The audit and the saved sample read the raw dates, before analysis parses them in place
+        audit_frame = df.copy(deep=False)
+        transaction_sample = audit_frame.head(100).to_dict(orient='records')
         
-        # Generate spending insights
-        insights = analysis_service.generate_spending_insights(categorized_data)
+        # Perform financial analysis and generate spending insights in one pass
+        analysis = analysis_service.analyze(df)
+        processed_data = analysis['processed_data']
+        categorized_data = analysis['categorized_data']
+        insights = analysis['insights']
         
         # Generate visualization data (pie chart and bar chart)
         visualizations = analysis_service.generate_visualization_data(categorized_data)
@@ -2257,11 +2721,11 @@ async def perform_company_audit(
         audit_report = audit_service.perform_audit(
             company_data=company_data,
             financial_data=financial_data,
-            transactions=valid_transactions
+            transactions=audit_frame
         )
         
         # Prepare full analysis data for saving
-        analysis_id = secrets.token_urlsafe(16)
+        analysis_id = _new_audit_id()
         
         # Save audit to history with full visualization data
         try:
@@ -2278,7 +2742,7 @@ async def perform_company_audit(
                 'insights': insights,
                 'visualizations': visualizations,
                 'smart_score': smart_score,
-                'transactions': valid_transactions[:100],  # Store sample of transactions for visualise tab
+                'transactions': transaction_sample,  # Store sample of transactions for visualise tab
                 'files_uploaded': [f.filename for f in files]
             }
             history_service.save_company_analysis(user_id, audit_record)
@@ -2288,7 +2752,7 @@ async def perform_company_audit(
             import traceback
             traceback.print_exc()
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "status": "success",
             "id": analysis_id,
             "audit_report": audit_report,
@@ -2296,7 +2760,7 @@ async def perform_company_audit(
             "insights": insights,
             "visualizations": visualizations,
             "smart_score": smart_score,
-            "transactions": valid_transactions[:100],  # Include sample for visualise tab
+            "transactions": transaction_sample,  # Include sample for visualise tab
             "warnings": all_file_warnings,
             "errors": all_file_errors,
             "missing_values": all_missing_values,  # Detailed missing value data for table
@@ -2315,18 +2779,8 @@ async def perform_company_audit(
 async def get_audit_history(user_id: str):
     """Get audit history for a company"""
     try:
-        history = history_service.get_company_history(user_id)
-        audits = [
-            {
-                'id': record.get('id'),
-                'company_name': record.get('company_name'),
-                'audit_date': record.get('audit_date'),
-                'audit_summary': record.get('audit_report', {}).get('audit_summary', {}),
-                'financial_summary': record.get('financial_summary', {})
-            }
-            for record in history if 'company_name' in record
-        ]
-        return JSONResponse(content={"status": "success", "audits": audits})
+        audits = history_service.get_audit_summaries(user_id)
+        return ORJSONResponse(content={"status": "success", "audits": audits})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching audit history: {str(e)}")
 
@@ -2336,7 +2790,7 @@ async def get_company_history(user_id: str):
     try:
         history = history_service.get_company_history(user_id)
         # Return full records for history tab
-        return JSONResponse(content={"status": "success", "history": history})
+        return ORJSONResponse(content={"status": "success", "history": history})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching history: {str(e)}")
 
@@ -2352,7 +2806,7 @@ async def get_company_analysis(analysis_id: str, user_id: str = None):
         if user_id and analysis.get('user_id') != user_id:
             raise HTTPException(status_code=403, detail="Access denied")
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "status": "success",
             "data": analysis
         })
@@ -2366,19 +2820,15 @@ async def get_company_analysis(analysis_id: str, user_id: str = None):
 async def get_audit_report(audit_id: str, user_id: str = None):
     """Get detailed audit report by ID"""
     try:
-        history = history_service.get_company_history(user_id) if user_id else []
-        
-        # Find the audit record
-        audit_record = None
-        for record in history:
-            if record.get('id') == audit_id:
-                audit_record = record
-                break
+        # Point lookup, then check the record is this user's company analysis
+        audit_record = history_service.get_analysis_by_id(audit_id) if user_id else None
+        if audit_record and (audit_record.get('user_id') != user_id or audit_record.get('account_type') != 'company'):
+            audit_record = None
         
         if not audit_record:
             raise HTTPException(status_code=404, detail="Audit report not found")
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "status": "success",
             "audit_report": audit_record.get('audit_report', {}),
             "metadata": {
@@ -2396,4 +2846,6 @@ async def get_audit_report(audit_id: str, user_id: str = None):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvicorn[standard] brings in uvloop and httptools; "auto" picks uvloop wherever it is
+    # available (it is not on Windows)
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="auto", http="httptools")
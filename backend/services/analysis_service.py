@@ -1,9 +1,106 @@
 import pandas as pd
-from typing import Dict, List, Any
+import numpy as np
+from typing import Dict, List, Any, Optional
 import re
 from datetime import datetime
 from collections import defaultdict
 
+# Optional Aho-Corasick automaton for single-pass keyword matching
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
+
+# Optional JIT compilation for the byte-level keyword scan
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    njit = None
+
+
+def _matching_keywords(category_keywords: Dict[str, List[str]]) -> Dict[str, tuple]:
+    """Lowercased keywords per matchable category, longest first, without keywords that can never decide a match
+    
+    A keyword containing a keyword of the same or an earlier category is dropped: wherever it
+    occurs, that shorter keyword occurs too and already picks the same or an earlier category.
+    """
+    kept_so_far = []
+    matching = {}
+    for category, keywords in category_keywords.items():
+        if category == 'Other':
+            continue
+        kept = []
+        for keyword in sorted(dict.fromkeys(keyword.lower() for keyword in keywords), key=len):
+            if not any(shorter in keyword for shorter in kept_so_far + kept):
+                kept.append(keyword)
+        kept_so_far.extend(kept)
+        matching[category] = tuple(sorted(kept, key=len, reverse=True))
+    return matching
+
+
+def _build_keyword_automaton(category_keywords: Dict[str, tuple]):
+    """Automaton mapping each (lowercase) keyword to (priority, category) of the first category listing it"""
+    automaton = ahocorasick.Automaton()
+    for priority, (category, keywords) in enumerate(category_keywords.items()):
+        for keyword in keywords:
+            if keyword not in automaton:
+                automaton.add_word(keyword, (priority, category))
+    automaton.make_automaton()
+    return automaton
+
+
+def _build_keyword_tables(category_keywords: Dict[str, tuple]):
+    """Packed ASCII keywords in priority order with their category index and Horspool skip tables"""
+    keywords = [(priority, keyword) for priority, words in enumerate(category_keywords.values()) for keyword in words]
+    if not all(keyword.isascii() for _, keyword in keywords):
+        return None
+    lengths = np.array([len(keyword) for _, keyword in keywords], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    buffer = np.frombuffer(''.join(keyword for _, keyword in keywords).encode('ascii'), dtype=np.uint8)
+    skips = np.repeat(lengths[:, None], 256, axis=1)
+    for index, (_, keyword) in enumerate(keywords):
+        for position, byte in enumerate(keyword[:-1].encode('ascii')):
+            skips[index, byte] = len(keyword) - 1 - position
+    categories = np.array([priority for priority, _ in keywords], dtype=np.int64)
+    return buffer, offsets, categories, skips
+
+
+def _first_keyword_category(text, text_offsets, keywords, keyword_offsets, keyword_categories, skips, default):
+    """Category of the first keyword (in priority order) found in each text, via Horspool search"""
+    count = text_offsets.shape[0] - 1
+    result = np.full(count, default, np.int64)
+    for row in range(count):
+        start, end = text_offsets[row], text_offsets[row + 1]
+        for index in range(keyword_categories.shape[0]):
+            keyword_start = keyword_offsets[index]
+            length = keyword_offsets[index + 1] - keyword_start
+            last = keywords[keyword_start + length - 1]
+            position = start
+            found = False
+            while position + length <= end:
+                byte = text[position + length - 1]
+                if byte == last:
+                    matched = length - 2
+                    while matched >= 0 and text[position + matched] == keywords[keyword_start + matched]:
+                        matched -= 1
+                    if matched < 0:
+                        found = True
+                        break
+                position += skips[index, byte]
+            if found:
+                result[row] = keyword_categories[index]
+                break
+    return result
+
+
+if NUMBA_AVAILABLE:
+    _first_keyword_category = njit(cache=True)(_first_keyword_category)
+
+
 class AnalysisService:
     """Service for analyzing financial data and generating spending insights"""
     
@@ -25,11 +122,90 @@ class AnalysisService:
         'Other': []
     }
     
+    # Keywords the matchers scan for, in category priority order ('Other' is the fallback)
+    _CATEGORY_KEYWORDS_LOWER = _matching_keywords(CATEGORY_KEYWORDS)
+    
+    def __init__(self):
+        self._keyword_automaton = (
+            _build_keyword_automaton(self._CATEGORY_KEYWORDS_LOWER) if AHOCORASICK_AVAILABLE else None
+        )
+        # Byte-level keyword tables for the compiled scan; None if a keyword isn't ASCII
+        self._keyword_tables = _build_keyword_tables(self._CATEGORY_KEYWORDS_LOWER) if NUMBA_AVAILABLE else None
+        self._category_labels = np.array(list(self._CATEGORY_KEYWORDS_LOWER) + ['Other'], dtype=object)
+        # One alternation of the keywords per category, in priority order
+        self._category_patterns = [
+            (category, re.compile('|'.join(map(re.escape, keywords))))
+            for category, keywords in self._CATEGORY_KEYWORDS_LOWER.items()
+            if keywords
+        ]
+    
+    def _match_category(self, description: str) -> str:
+        """First category (in CATEGORY_KEYWORDS order) with a keyword in the lowercased description"""
+        # One scan finds every keyword occurrence; the earliest-listed category wins
+        hit = min((value for _, value in self._keyword_automaton.iter(description)), default=None)
+        return hit[1] if hit is not None else 'Other'
+    
+    def _categorize_descriptions(self, descriptions: pd.Series) -> List[str]:
+        """Category for each lowercased description: compiled byte scan, automaton or regex column scan"""
+        if self._keyword_tables is not None:
+            values = descriptions.tolist()
+            if all(value.isascii() for value in values):
+                encoded = [value.encode('ascii') for value in values]
+                offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+                np.cumsum([len(value) for value in encoded], out=offsets[1:])
+                text = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+                codes = _first_keyword_category(text, offsets, *self._keyword_tables, len(self._category_labels) - 1)
+                return self._category_labels[codes].tolist()
+        
+        if self._keyword_automaton is not None:
+            return [self._match_category(description) for description in descriptions]
+        
+        # Each category's pattern runs over the whole column; np.select keeps the first match per row
+        masks = [
+            descriptions.str.contains(pattern, regex=True).to_numpy(dtype=bool)
+            for _, pattern in self._category_patterns
+        ]
+        categories = [category for category, _ in self._category_patterns]
+        return np.select(masks, categories, default='Other').tolist()
+    
+    @staticmethod
+    def _iso_dates(dates: pd.Series) -> List[Optional[str]]:
+        """isoformat() of each date, None where missing; whole-second naive dates format column-wise"""
+        values = dates.to_numpy()
+        if values.dtype.kind == 'M':
+            present = ~np.isnat(values)
+            if (values[present].astype('datetime64[s]') == values[present]).all():
+                strings = np.datetime_as_string(values, unit='s').astype(object)
+                strings[~present] = None
+                return strings.tolist()
+        return [date.isoformat() if pd.notna(date) else None for date in dates]
+    
+    @classmethod
+    def _listing_dates(cls, dates: pd.Series) -> List[str]:
+        """_date_string of every date, formatted column-wise when the column is already datetime"""
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            # Missing datetimes are NaT, whose isoformat() is 'NaT'
+            return ['NaT' if date is None else date for date in cls._iso_dates(dates)]
+        return [cls._date_string(date_val) for date_val in dates]
+    
+    @staticmethod
+    def _date_string(date_val: Any) -> str:
+        """Convert date to string if it's a Timestamp/datetime"""
+        if hasattr(date_val, 'isoformat'):
+            return date_val.isoformat()
+        if hasattr(date_val, 'strftime'):
+            return date_val.strftime('%Y-%m-%d')
+        return str(date_val) if date_val else ''
+    
     def process_data(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Process raw financial data"""
-        # Ensure date column is datetime
-        if 'date' in df.columns:
-            df['date'] = pd.to_datetime(df['date'], errors='coerce')
+        # Ensure date column is datetime (parsed once; uploads arrive as YYYY-MM-DD strings)
+        if 'date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['date']):
+            parsed = pd.to_datetime(df['date'], format='%Y-%m-%d', errors='coerce', cache=True)
+            if (parsed.isna() & df['date'].notna()).any():
+                # Some dates use another format - parse by inference as before
+                parsed = pd.to_datetime(df['date'], errors='coerce', cache=True)
+            df['date'] = parsed
         
         # Ensure amount is numeric
         df['amount'] = pd.to_numeric(df['amount'], errors='coerce')
@@ -54,25 +230,13 @@ class AnalysisService:
         df['amount'] = df['amount'].abs()
         
         # Convert DataFrame to dict and ensure all dates are strings for JSON serialization
-        transactions_list = []
-        for _, row in df.iterrows():
-            amount_val = float(row['amount'])  # Already absolute at this point
-            transaction = {
-                'amount': amount_val,  # Already absolute
-                'description': str(row['description'])
-            }
-            # Convert date to string if present
-            if 'date' in df.columns and pd.notna(row['date']):
-                if hasattr(row['date'], 'isoformat'):
-                    transaction['date'] = row['date'].isoformat()
-                elif hasattr(row['date'], 'strftime'):
-                    transaction['date'] = row['date'].strftime('%Y-%m-%d')
-                else:
-                    transaction['date'] = str(row['date'])
-            else:
-                transaction['date'] = None
-            
-            transactions_list.append(transaction)
+        amounts = df['amount'].to_numpy(dtype='float64').tolist()  # Already absolute
+        descriptions = df['description'].map(str).tolist()
+        dates = self._iso_dates(df['date']) if 'date' in df.columns else [None] * len(df)
+        transactions_list = [
+            {'amount': amount, 'description': description, 'date': date}
+            for amount, description, date in zip(amounts, descriptions, dates)
+        ]
         
         # Calculate date range
         date_start = None
@@ -98,59 +262,40 @@ class AnalysisService:
             "transactions": transactions_list
         }
     
-    def categorize_expenses(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Categorize expenses based on description"""
-        categorized = defaultdict(list)
-        category_totals = defaultdict(float)
-        uncategorized = []
-        
-        for _, row in df.iterrows():
-            description = str(row.get('description', '')).lower()
-            # Amount is already absolute from process_data
-            amount = float(row.get('amount', 0))
-            # Ensure it's positive (defensive check)
-            amount = abs(amount)
-            
-            category_found = False
-            for category, keywords in self.CATEGORY_KEYWORDS.items():
-                if category == 'Other':
-                    continue
-                # Check if any keyword matches in the description (case-insensitive)
-                if any(keyword.lower() in description for keyword in keywords):
-                    # Convert date to string if it's a Timestamp/datetime
-                    date_val = row.get('date', '')
-                    if hasattr(date_val, 'isoformat'):
-                        date_val = date_val.isoformat()
-                    elif hasattr(date_val, 'strftime'):
-                        date_val = date_val.strftime('%Y-%m-%d')
-                    else:
-                        date_val = str(date_val) if date_val else ''
-                    
-                    categorized[category].append({
-                        'description': row.get('description', ''),
-                        'amount': amount,
-                        'date': date_val
-                    })
-                    category_totals[category] += amount
-                    category_found = True
-                    break
-            
-            if not category_found:
-                # Convert date to string if it's a Timestamp/datetime
-                date_val = row.get('date', '')
-                if hasattr(date_val, 'isoformat'):
-                    date_val = date_val.isoformat()
-                elif hasattr(date_val, 'strftime'):
-                    date_val = date_val.strftime('%Y-%m-%d')
-                else:
-                    date_val = str(date_val) if date_val else ''
-                
-                categorized['Other'].append({
-                    'description': row.get('description', ''),
-                    'amount': amount,
-                    'date': date_val
-                })
-                category_totals['Other'] += amount
+    def analyze(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Process, categorize and summarize transactions in one pass over the columns
+        
+        Returns processed_data, categorized_data and insights. categorized_data has the
+        category totals and percentages but not the per-category transaction listings.
+        """
+        processed_data = self.process_data(df)
+        categories, amounts, _ = self._category_assignments(df)
+        categorized_data = self._category_summary(categories, amounts, df)
+        return {
+            "processed_data": processed_data,
+            "categorized_data": categorized_data,
+            "insights": self.generate_spending_insights(categorized_data)
+        }
+    
+    def _category_assignments(self, df: pd.DataFrame) -> tuple:
+        """Category, absolute amount and raw description of every row"""
+        row_count = len(df)
+        raw_descriptions = df['description'] if 'description' in df.columns else pd.Series([''] * row_count, index=df.index)
+        categories = self._categorize_descriptions(raw_descriptions.map(str).str.lower())
+        
+        # Amount is already absolute from process_data; abs() is a defensive check
+        if 'amount' in df.columns:
+            amounts = np.abs(df['amount'].to_numpy(dtype='float64'))
+        else:
+            amounts = np.zeros(row_count)
+        return categories, amounts, raw_descriptions
+    
+    def _category_summary(self, categories: List[str], amounts: np.ndarray, df: pd.DataFrame) -> Dict[str, Any]:
+        """Category totals (in first-seen order) and percentages of the total spend"""
+        # bincount adds each category's amounts in row order, like summing them one by one
+        codes, labels = pd.factorize(np.asarray(categories, dtype=object))
+        totals = np.bincount(codes, weights=amounts, minlength=len(labels))
+        category_totals = dict(zip(labels.tolist(), totals.tolist()))
         
         # Calculate percentages
         # total_amount = sum of all expenses (already absolute values)
@@ -167,13 +312,30 @@ class AnalysisService:
         }
         
         return {
-            "categories": dict(categorized),
-            "category_totals": dict(category_totals),
+            "category_totals": category_totals,
             "category_percentages": category_percentages,
             "total_amount": total_debits,  # Total expenses (debits)
             "transaction_count": len(df)
         }
     
+    def categorize_expenses(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Categorize expenses based on description"""
+        categories, amounts, raw_descriptions = self._category_assignments(df)
+        dates = self._listing_dates(df['date']) if 'date' in df.columns else [''] * len(df)
+        
+        categorized = defaultdict(list)
+        for category, description, amount, date_val in zip(categories, raw_descriptions.tolist(), amounts.tolist(), dates):
+            categorized[category].append({
+                'description': description,
+                'amount': amount,
+                'date': date_val
+            })
+        
+        return {
+            "categories": dict(categorized),
+            **self._category_summary(categories, amounts, df)
+        }
+    
     def generate_spending_insights(self, categorized_data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate insights from categorized spending data"""
         category_percentages = categorized_data['category_percentages']
@@ -9,7 +9,7 @@ import json
 import os
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 from pathlib import Path
 
@@ -142,14 +142,15 @@ class AuditService:
             return "✅ Normal"
     
     def perform_audit(self, company_data: Dict, financial_data: Dict, 
-                     transactions: List[Dict]) -> Dict[str, Any]:
+                     transactions: Union[List[Dict], pd.DataFrame]) -> Dict[str, Any]:
         """
         Perform comprehensive fraud detection audit on company transactions
         
         Args:
             company_data: Company information (name, industry, size, etc.)
             financial_data: Financial summaries and analysis
-            transactions: List of all transactions
+            transactions: List of all transactions, or a DataFrame with
+                amount/description/date columns
         
         Returns:
             Comprehensive fraud detection report with findings, risks, and recommendations
@@ -157,23 +158,28 @@ class AuditService:
         try:
             print(f"[AUDIT] Starting fraud detection for {company_data.get('company_name', 'Unknown')}")
             
-            if not transactions or len(transactions) == 0:
+            if transactions is None or len(transactions) == 0:
                 return self._fallback_audit(company_data, financial_data, transactions)
             
             # Extract amounts and descriptions
-            amounts = []
-            descriptions = []
-            
-            for txn in transactions:
-                # Extract amount (handle different field names)
-                amount = abs(float(txn.get('amount', txn.get('Amount', txn.get('amount_abs', 0)))))
-                amounts.append(amount)
+            if isinstance(transactions, pd.DataFrame):
+                # Columnar input already uses the normalized field names
+                amounts = np.abs(transactions['amount'].to_numpy(dtype='float64')).tolist()
+                descriptions = transactions['description'].astype(str).tolist()
+            else:
+                amounts = []
+                descriptions = []
                 
-                # Extract description
-                desc = str(txn.get('description', txn.get('Description', '')))
-                if not desc:
-                    desc = str(txn.get('vendor', txn.get('Vendor/Customer', txn.get('account', txn.get('Account', '')))))
-                descriptions.append(desc)
+                for txn in transactions:
+                    # Extract amount (handle different field names)
+                    amount = abs(float(txn.get('amount', txn.get('Amount', txn.get('amount_abs', 0)))))
+                    amounts.append(amount)
+                    
+                    # Extract description
+                    desc = str(txn.get('description', txn.get('Description', '')))
+                    if not desc:
+                        desc = str(txn.get('vendor', txn.get('Vendor/Customer', txn.get('account', txn.get('Account', '')))))
+                    descriptions.append(desc)
             
             # Calculate amount-based scores
             amount_data = self._calculate_amount_score(amounts)
@@ -188,7 +194,7 @@ class AuditService:
             
             # Create DataFrame for analysis
             df = pd.DataFrame({
-                'transaction': transactions,
+                'position': np.arange(len(amounts)),
                 'amount': amounts,
                 'description': descriptions,
                 'amount_score': amount_scores,
@@ -224,9 +230,8 @@ class AuditService:
             # Build suspicious transactions list
             suspicious_transactions = []
             for record in top_suspicious:
-                txn = record['transaction']
                 suspicious_transactions.append({
-                    'date': txn.get('date', txn.get('Date', '')),
+                    'date': self._transaction_date(transactions, record['position']),
                     'amount': record['amount'],
                     'description': record['description'],
                     'suspicion_index': round(record['suspicion_index'], 4),
@@ -352,8 +357,16 @@ class AuditService:
             # Fallback to rule-based audit
             return self._fallback_audit(company_data, financial_data, transactions)
     
+    @staticmethod
+    def _transaction_date(transactions: Union[List[Dict], pd.DataFrame], position: int) -> Any:
+        """Date of the transaction at a position, from either input shape"""
+        if isinstance(transactions, pd.DataFrame):
+            return transactions['date'].iat[position] if 'date' in transactions.columns else ''
+        txn = transactions[position]
+        return txn.get('date', txn.get('Date', ''))
+    
     def _fallback_audit(self, company_data: Dict, financial_data: Dict, 
-                       transactions: List[Dict]) -> Dict[str, Any]:
+                       transactions: Union[List[Dict], pd.DataFrame]) -> Dict[str, Any]:
         """Fallback rule-based audit when API is not available"""
         print("[AUDIT] Using fallback rule-based audit")
         
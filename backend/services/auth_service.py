@@ -1,11 +1,14 @@
 import json
 import hashlib
+import logging
 import secrets
 from datetime import datetime, timedelta
 from typing import Dict, Optional
 from pathlib import Path
 import random
 
+logger = logging.getLogger(__name__)
+
 class AuthService:
     """Authentication service for user management"""
     
@@ -124,31 +127,30 @@ class AuthService:
         hashed_password = self._hash_password(password)
         
         # DEBUG: Log login attempt
-        print(f"[LOGIN DEBUG] Attempting login for: {username}")
-        print(f"[LOGIN DEBUG] Password hash: {hashed_password[:20]}...")
-        print(f"[LOGIN DEBUG] Total users: {len(self.users.get('users', []))}")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("[LOGIN DEBUG] Attempting login for: %s", username)
+            logger.debug("[LOGIN DEBUG] Total users: %d", len(self.users.get('users', [])))
         
         for user in self.users.get("users", []):
             username_match = user.get("username") == username or user.get("email") == username
             password_match = user.get("password") == hashed_password
             
-            print(f"[LOGIN DEBUG] Checking user: {user.get('username')} (email: {user.get('email')})")
-            print(f"[LOGIN DEBUG]   Username match: {username_match}")
-            print(f"[LOGIN DEBUG]   Password match: {password_match}")
-            print(f"[LOGIN DEBUG]   Stored hash: {user.get('password', '')[:20]}...")
-            print(f"[LOGIN DEBUG]   Is verified: {user.get('is_verified', False)}")
+            if debug:
+                logger.debug("[LOGIN DEBUG] Checking user: %s, username match: %s, password match: %s, verified: %s",
+                             user.get('username'), username_match, password_match, user.get('is_verified', False))
             
             if username_match and password_match:
-                print(f"[LOGIN DEBUG] ✅ MATCH FOUND for user: {user.get('username')}")
+                logger.debug("[LOGIN DEBUG] Match found for user: %s", user.get('username'))
                 
                 if not user.get("is_verified", False):
-                    print(f"[LOGIN DEBUG] ❌ User not verified")
+                    logger.debug("[LOGIN DEBUG] User not verified")
                     return {
                         "success": False,
                         "message": "Please verify your account with OTP first"
                     }
                 
-                print(f"[LOGIN DEBUG] ✅ User verified, returning success")
+                logger.debug("[LOGIN DEBUG] User verified, returning success")
                 user_obj = {
                     "id": user["id"],
                     "username": user["username"],
@@ -157,7 +159,6 @@ class AuthService:
                     "full_name": user["full_name"],
                     "is_admin": user.get("is_admin", False)
                 }
-                print(f"[LOGIN DEBUG] Returning user object: {user_obj}")
                 return {
                     "success": True,
                     "user": user_obj,
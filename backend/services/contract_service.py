@@ -9,6 +9,8 @@ class ContractService:
     def __init__(self, db_path: str = "database/contracts.json"):
         self.db_path = db_path
         self._ensure_db()
+        # Contracts keyed by id for point lookups; rebuilt on every write
+        self._by_id: Dict[str, Dict[str, Any]] = self._index(self._load_db())
     
     def _ensure_db(self):
         """Ensure the contracts database file exists"""
@@ -29,6 +31,12 @@ class ContractService:
         """Save contracts to database"""
         with open(self.db_path, 'w') as f:
             json.dump(data, f, indent=2)
+        self._by_id = self._index(data)
+    
+    @staticmethod
+    def _index(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Map contract id to contract"""
+        return {c.get("id"): c for c in data.get("contracts", [])}
     
     def request_contract(self, company_id: str, company_name: str) -> Dict[str, Any]:
         """Company requests a contract"""
@@ -118,6 +126,15 @@ class ContractService:
         self._save_db(db)
         return contract
     
+    def get_contract_by_id(self, contract_id: str) -> Optional[Dict[str, Any]]:
+        """Get a contract by ID"""
+        return self._by_id.get(contract_id)
+    
+    def get_signed_path(self, contract_id: str) -> Optional[str]:
+        """Get the stored signed PDF path for a contract, if it has one"""
+        contract = self._by_id.get(contract_id)
+        return contract.get("signed_contract_pdf_path") if contract else None
+    
     def get_all_contracts(self) -> List[Dict[str, Any]]:
         """Get all contracts for admin"""
         db = self._load_db()
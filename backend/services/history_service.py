@@ -1,5 +1,7 @@
 import json
 import os
+import time
+import orjson
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from pathlib import Path
@@ -7,10 +9,21 @@ from pathlib import Path
 class HistoryService:
     """Service for managing analysis history for users"""
     
+    # Queued records are written once this many are pending (or on the next read/flush)
+    FLUSH_BATCH_SIZE = 32
+    # Seconds a user's history listing is served from memory; writes through this service invalidate it
+    USER_HISTORY_TTL = 5.0
+    
     def __init__(self):
         self.db_dir = Path(__file__).parent.parent / "database"
         self.history_file = self.db_dir / "history.json"
+        self._pending: List[Dict[str, Any]] = []
+        self._user_history_cache: Dict[tuple, tuple] = {}
         self._ensure_db_exists()
+        # Records keyed by id for point lookups; rebuilt on every write, or when the file
+        # changes on disk (compared by mtime and size)
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._indexed_stat: Optional[tuple] = None
     
     def _ensure_db_exists(self):
         """Ensure database directory and history file exist"""
@@ -20,25 +33,50 @@ class HistoryService:
                 json.dump({"analyses": []}, f, indent=2)
     
     def _load_history(self) -> Dict[str, Any]:
-        """Load history from JSON file"""
+        """Load history from JSON file, writing out any queued records first"""
+        self.flush_pending()
+        return self._read_history()
+    
+    def _read_history(self) -> Dict[str, Any]:
+        """Read the history JSON file as it is on disk"""
         try:
-            with open(self.history_file, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+            with open(self.history_file, 'rb') as f:
+                return orjson.loads(f.read())
+        except (FileNotFoundError, orjson.JSONDecodeError):
             return {"analyses": []}
     
+    def _history_stat(self) -> Optional[tuple]:
+        """mtime and size of the history file, or None if it is missing"""
+        try:
+            stat = os.stat(self.history_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _index(self, data: Dict[str, Any], stat: Optional[tuple]):
+        """Map analysis id to record (first record wins, as a scan would) for the file as of stat"""
+        by_id: Dict[str, Dict[str, Any]] = {}
+        for analysis in data.get("analyses", []):
+            by_id.setdefault(analysis.get("id"), analysis)
+        self._by_id = by_id
+        self._indexed_stat = stat
+    
+    def _invalidate_user_history(self, user_id: str):
+        """Drop cached history listings for a user after their records change"""
+        for key in [key for key in self._user_history_cache if key[0] == user_id]:
+            del self._user_history_cache[key]
+    
     def _save_history(self, data: Dict[str, Any]):
-        """Save history to JSON file"""
-        with open(self.history_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        """Save history to JSON file (same indented layout as json.dump, serialized by orjson)"""
+        with open(self.history_file, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
+        self._index(data, self._history_stat())
     
-    def save_analysis(self, user_id: str, account_type: str, analysis_data: Dict[str, Any]) -> str:
-        """Save an analysis to history and return the analysis ID"""
-        history = self._load_history()
-        
+    def _analysis_record(self, user_id: str, account_type: str, analysis_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the history record stored for an analysis"""
         analysis_id = f"analysis_{datetime.now().timestamp()}"
         
-        analysis_record = {
+        return {
             "id": analysis_id,
             "user_id": user_id,
             "account_type": account_type,  # 'personal' or 'company'
@@ -56,14 +94,54 @@ class HistoryService:
             "file_errors": analysis_data.get("file_errors", []),
             "file_warnings": analysis_data.get("file_warnings", [])
         }
+    
+    def save_analysis(self, user_id: str, account_type: str, analysis_data: Dict[str, Any]) -> str:
+        """Save an analysis to history and return the analysis ID"""
+        history = self._load_history()
+        
+        analysis_record = self._analysis_record(user_id, account_type, analysis_data)
         
         history["analyses"].append(analysis_record)
         self._save_history(history)
+        self._invalidate_user_history(user_id)
         
-        return analysis_id
+        return analysis_record["id"]
+    
+    def enqueue_analysis(self, user_id: str, account_type: str, analysis_data: Dict[str, Any]) -> str:
+        """Queue an analysis for a batched history write and return the analysis ID"""
+        analysis_record = self._analysis_record(user_id, account_type, analysis_data)
+        self._pending.append(analysis_record)
+        self._invalidate_user_history(user_id)
+        
+        if len(self._pending) >= self.FLUSH_BATCH_SIZE:
+            self.flush_pending()
+        
+        return analysis_record["id"]
+    
+    def flush_pending(self) -> int:
+        """Write all queued records with a single load/save of the history file"""
+        if not self._pending:
+            return 0
+        
+        batch, self._pending = self._pending, []
+        try:
+            history = self._read_history()
+            history["analyses"].extend(batch)
+            self._save_history(history)
+        except Exception:
+            # Keep the records queued so the next flush retries them
+            self._pending[:0] = batch
+            raise
+        
+        return len(batch)
     
     def get_user_history(self, user_id: str, account_type: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get analysis history for a specific user"""
+        """Get analysis history for a specific user (cached for USER_HISTORY_TTL seconds)"""
+        key = (user_id, account_type)
+        cached = self._user_history_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return list(cached[1])
+        
         history = self._load_history()
         
         # Filter by user_id and optionally by account_type
@@ -76,13 +154,20 @@ class HistoryService:
         # Sort by created_at (most recent first)
         user_analyses.sort(key=lambda x: x.get("created_at", ""), reverse=True)
         
-        return user_analyses
+        self._user_history_cache[key] = (time.monotonic() + self.USER_HISTORY_TTL, user_analyses)
+        return list(user_analyses)
     
     def get_analysis_by_id(self, analysis_id: str) -> Optional[Dict[str, Any]]:
-        """Get a specific analysis by ID"""
-        history = self._load_history()
+        """Get a specific analysis by ID from the id index, falling back to queued records"""
+        stat = self._history_stat()
+        if stat is None or stat != self._indexed_stat:
+            self._index(self._read_history(), stat)
         
-        for analysis in history.get("analyses", []):
+        analysis = self._by_id.get(analysis_id)
+        if analysis is not None:
+            return analysis
+        
+        for analysis in self._pending:
             if analysis.get("id") == analysis_id:
                 return analysis
         
@@ -103,6 +188,7 @@ class HistoryService:
         
         if removed:
             self._save_history(history)
+            self._invalidate_user_history(user_id)
         
         return removed
     
@@ -133,21 +219,31 @@ class HistoryService:
         
         history["analyses"].append(analysis_record)
         self._save_history(history)
+        self._invalidate_user_history(user_id)
         
         return analysis_id
     
     def get_company_history(self, user_id: str) -> List[Dict[str, Any]]:
-        """Get company analysis history for a specific user"""
-        history = self._load_history()
-        
-        # Filter by user_id and account_type 'company'
-        company_analyses = [
-            analysis for analysis in history.get("analyses", [])
-            if analysis.get("user_id") == user_id and analysis.get("account_type") == "company"
+        """Get company analysis history for a specific user (shares the user history cache)"""
+        return self.get_user_history(user_id, account_type="company")
+    
+    def get_audit_summaries(self, user_id: str) -> List[Dict[str, Any]]:
+        """Get the audit history listing rows for a user (cached alongside their history)"""
+        key = (user_id, "company", "audit_summaries")
+        cached = self._user_history_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return list(cached[1])
+        
+        summaries = [
+            {
+                'id': record.get('id'),
+                'company_name': record.get('company_name'),
+                'audit_date': record.get('audit_date'),
+                'audit_summary': record.get('audit_report', {}).get('audit_summary', {}),
+                'financial_summary': record.get('financial_summary', {})
+            }
+            for record in self.get_company_history(user_id) if 'company_name' in record
         ]
         
-        # Sort by created_at (most recent first)
-        company_analyses.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-        
-        return company_analyses
-
+        self._user_history_cache[key] = (time.monotonic() + self.USER_HISTORY_TTL, summaries)
+        return list(summaries)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Test that keyword categorization matches the first-category-wins substring rule on every matcher path"""
+import random
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+import services.analysis_service as analysis_service
+from services.analysis_service import AnalysisService
+
+EDGE_CASES = ['', 'x', 'ubereats', 'netflix premium', 'rd', 'bird', 'amazon prime video',
+              'upi/dr/530412682538/vishwas/es fb/neokred.85', 'gas station', 'the uber-eats order']
+
+def baseline_category(description: str) -> str:
+    """The original rule: first category in CATEGORY_KEYWORDS order with any keyword in the description"""
+    description = description.lower()
+    for category, keywords in AnalysisService.CATEGORY_KEYWORDS.items():
+        if any(keyword.lower() in description for keyword in keywords):
+            return category
+    return 'Other'
+
+def random_descriptions(count: int, seed: int, ascii_only: bool):
+    """Descriptions mixing category keywords, fragments of them and noise words"""
+    rng = random.Random(seed)
+    keywords = [keyword for words in AnalysisService.CATEGORY_KEYWORDS.values() for keyword in words]
+    noise = ['transfer', 'to', 'from', 'ref', '4897695162091', 'upi/dr', 'xyz', 'pay', 'online-', 'a', 'the']
+    if not ascii_only:
+        noise += ['café', 'naïve', '₹250', 'über']
+    descriptions = []
+    for _ in range(count):
+        words = []
+        for _ in range(rng.randint(0, 5)):
+            choice = rng.random()
+            if choice < 0.4:
+                words.append(rng.choice(keywords))
+            elif choice < 0.6:
+                keyword = rng.choice(keywords)
+                words.append(keyword[:rng.randint(1, len(keyword))])
+            else:
+                words.append(rng.choice(noise))
+        descriptions.append(rng.choice([' ', '', '/']).join(words).lower())
+    return descriptions
+
+def make_service(numba: bool, ahocorasick: bool) -> AnalysisService:
+    """Instantiate the service with the chosen matchers enabled (the kernel runs as Python without numba)"""
+    numba_saved, ahocorasick_saved = analysis_service.NUMBA_AVAILABLE, analysis_service.AHOCORASICK_AVAILABLE
+    analysis_service.NUMBA_AVAILABLE = numba
+    analysis_service.AHOCORASICK_AVAILABLE = ahocorasick
+    try:
+        return AnalysisService()
+    finally:
+        analysis_service.NUMBA_AVAILABLE, analysis_service.AHOCORASICK_AVAILABLE = numba_saved, ahocorasick_saved
+
+def test_categorization():
+    """Compare _categorize_descriptions with the baseline rule for each matcher"""
+    print("=" * 60)
+    print("TESTING KEYWORD CATEGORIZATION")
+    print("=" * 60)
+
+    services = {
+        'regex column scan': make_service(numba=False, ahocorasick=False),
+        'byte-scan kernel': make_service(numba=True, ahocorasick=False),
+    }
+    if analysis_service.ahocorasick is not None:
+        services['aho-corasick automaton'] = make_service(numba=False, ahocorasick=True)
+    else:
+        print("  aho-corasick automaton: skipped (pyahocorasick not installed)")
+
+    inputs = {
+        'edge cases': [description.lower() for description in EDGE_CASES],
+        'random ascii': random_descriptions(2000, seed=7, ascii_only=True),
+        'random with non-ascii': random_descriptions(2000, seed=11, ascii_only=False),
+    }
+
+    ok = True
+    for service_name, service in services.items():
+        for input_name, descriptions in inputs.items():
+            expected = [baseline_category(description) for description in descriptions]
+            actual = service._categorize_descriptions(pd.Series(descriptions, dtype=object))
+            mismatches = [(d, e, a) for d, e, a in zip(descriptions, expected, actual) if e != a]
+            print(f"  {service_name} / {input_name}: {len(descriptions) - len(mismatches)}/{len(descriptions)} match")
+            for description, want, got in mismatches[:5]:
+                print(f"    {description!r}: expected {want}, got {got}")
+            ok = ok and not mismatches
+
+    if ok:
+        print(f"\n✅ SUCCESS: All matchers agree with the first-category-wins rule!")
+    else:
+        print(f"\n❌ FAILED: Some descriptions were categorized differently!")
+    return ok
+
+if __name__ == "__main__":
+    success = test_categorization()
+    sys.exit(0 if success else 1)
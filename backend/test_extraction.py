@@ -51,9 +51,9 @@ def test_csv_extraction():
     
     print(f"\nExtracted {len(transactions)} transactions")
     
-    if transactions:
-        total_amount = sum(t.get('amount', 0) for t in transactions)
-        non_zero = [t for t in transactions if t.get('amount', 0) > 0]
+    if not transactions.empty:
+        total_amount = transactions['amount'].sum()
+        non_zero = transactions[transactions['amount'] > 0]
         
         print(f"\nResults:")
         print(f"  Total transactions: {len(transactions)}")
@@ -62,7 +62,7 @@ def test_csv_extraction():
         print(f"  Expected total (debits only): ₹{3762.80:.2f}")
         
         print(f"\nSample transactions (first 5):")
-        for i, txn in enumerate(transactions[:5], 1):
+        for i, txn in enumerate(transactions.head(5).to_dict(orient='records'), 1):
             print(f"  {i}. ₹{txn.get('amount', 0):.2f} - {txn.get('description', 'N/A')[:50]}")
         
         if total_amount > 0:
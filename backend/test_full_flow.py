@@ -32,11 +32,11 @@ print(f"\n1. Loaded DataFrame: {df.shape}")
 # Step 2: Normalize transactions
 transactions = normalize_transactions(df)
 print(f"2. Normalized transactions: {len(transactions)}")
-total_from_txns = sum(t.get('amount', 0) for t in transactions)
+total_from_txns = transactions['amount'].sum()
 print(f"   Total from transactions: ₹{total_from_txns:.2f}")
 
-# Step 3: Convert to DataFrame for analysis
-df_for_analysis = pd.DataFrame(transactions)
+# Step 3: Transactions are already a DataFrame for analysis
+df_for_analysis = transactions
 print(f"3. DataFrame for analysis: {df_for_analysis.shape}")
 print(f"   Amount column sum: ₹{df_for_analysis['amount'].sum():.2f}")
 
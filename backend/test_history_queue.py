@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Test that queued company analyses are readable at once and written out on shutdown"""
+import sys
+import os
+import tempfile
+from pathlib import Path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import orjson
+from fastapi.testclient import TestClient
+import main
+
+ANALYSIS_DATA = {
+    "total_transactions": 2,
+    "total_amount": 150.0,
+    "insights": {"top_category": {"name": "Food"}, "category_breakdown": {"Food": 150.0}},
+}
+
+def read_ids(path: Path):
+    with open(path, 'rb') as f:
+        return {record["id"] for record in orjson.loads(f.read())["analyses"]}
+
+def test_history_queue():
+    """Enqueue analyses while the app runs and check reads and the shutdown flush"""
+    print("=" * 60)
+    print("TESTING QUEUED HISTORY WRITES")
+    print("=" * 60)
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        # Point the service at a scratch file so the real history database is untouched
+        history_file = Path(tmp) / "history.json"
+        history_file.write_bytes(orjson.dumps({"analyses": []}))
+        main.history_service.history_file = history_file
+        # Keep the background flusher idle so only the shutdown hook writes the queue
+        main.HISTORY_FLUSH_INTERVAL = 3600
+
+        with TestClient(main.app):
+            first_id = main.history_service.enqueue_analysis("queue_user", "company", ANALYSIS_DATA)
+            record = main.history_service.get_analysis_by_id(first_id)
+            visible = record is not None and record.get("total_amount") == 150.0
+            print(f"  visible right after enqueue: {'ok' if visible else 'FAILED'}")
+            ok = ok and visible
+
+            second_id = main.history_service.enqueue_analysis("queue_user", "company", ANALYSIS_DATA)
+            queued = second_id not in read_ids(history_file)
+            print(f"  second record still queued before shutdown: {'ok' if queued else 'FAILED'}")
+            ok = ok and queued
+
+        ids = read_ids(history_file)
+        flushed = {first_id, second_id} <= ids and not main.history_service._pending
+        print(f"  records written on shutdown: {'ok' if flushed else 'FAILED'}")
+        ok = ok and flushed
+
+        # A write from outside the service must not be hidden by the id index
+        history_file.write_bytes(orjson.dumps({"analyses": [{"id": "external_record", "user_id": "queue_user"}]}))
+        reindexed = (main.history_service.get_analysis_by_id("external_record") is not None
+                     and main.history_service.get_analysis_by_id(first_id) is None)
+        print(f"  index follows external changes to the file: {'ok' if reindexed else 'FAILED'}")
+        ok = ok and reindexed
+
+    if ok:
+        print(f"\n✅ SUCCESS: Queued analyses are readable and flushed on shutdown!")
+    else:
+        print(f"\n❌ FAILED: Queued analyses were lost or not visible!")
+    return ok
+
+if __name__ == "__main__":
+    success = test_history_queue()
+    sys.exit(0 if success else 1)
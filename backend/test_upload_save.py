@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Test that uploads are saved byte for byte, both while spooled in memory and once rolled to disk"""
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import UploadFile
+from starlette.formparsers import MultiPartParser
+import main
+
+def make_upload(data: bytes) -> UploadFile:
+    """Build an UploadFile the way Starlette's multipart parser does"""
+    spooled = tempfile.SpooledTemporaryFile(max_size=MultiPartParser.spool_max_size)
+    spooled.write(data)
+    return UploadFile(spooled, size=len(data), filename="signed.pdf")
+
+def test_upload_save():
+    """Save a small and a large upload and check the bytes and the copy path used"""
+    print("=" * 60)
+    print("TESTING UPLOAD SAVING")
+    print("=" * 60)
+
+    # Count kernel copies so each case proves which branch it took
+    sendfile_calls = []
+    real_sendfile = getattr(os, "sendfile", None)
+    if real_sendfile is not None:
+        def counting_sendfile(*args):
+            sendfile_calls.append(args)
+            return real_sendfile(*args)
+        main.os.sendfile = counting_sendfile
+
+    cases = {
+        "in-memory (copied in Python)": (os.urandom(64 * 1024), False),
+        "rolled to disk (sendfile)": (os.urandom(3 * MultiPartParser.spool_max_size + 123), real_sendfile is not None),
+    }
+
+    ok = True
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, (data, expect_sendfile) in cases.items():
+                sendfile_calls.clear()
+                path = os.path.join(tmp, "saved.pdf")
+                upload = make_upload(data)
+                main._save_upload(upload, path)
+                upload.file.close()
+                with open(path, "rb") as f:
+                    same = f.read() == data
+                used_sendfile = bool(sendfile_calls)
+                passed = same and used_sendfile == expect_sendfile
+                print(f"  {name}: bytes {'match' if same else 'DIFFER'}, sendfile={used_sendfile} {'ok' if passed else 'FAILED'}")
+                ok = ok and passed
+    finally:
+        if real_sendfile is not None:
+            main.os.sendfile = real_sendfile
+
+    if ok:
+        print(f"\n✅ SUCCESS: Uploads are saved intact on both copy paths!")
+    else:
+        print(f"\n❌ FAILED: Saved uploads did not match!")
+    return ok
+
+if __name__ == "__main__":
+    success = test_upload_save()
+    sys.exit(0 if success else 1)
@@ -17,5 +17,7 @@ pip install -r requirements.txt
 
 # Run the server
 echo "Starting backend server on http://localhost:8000"
-uvicorn main:app --reload --host 0.0.0.0 --port 8000
+# uvloop event loop and httptools HTTP parser (both installed by uvicorn[standard]).
+# Keep a single worker: the parse cache and batched history writes live in-process
+uvicorn main:app --reload --host 0.0.0.0 --port 8000 --loop uvloop --http httptools
 